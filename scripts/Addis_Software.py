@@ -1,16 +1,17 @@
 import os
-import requests
 from bs4 import BeautifulSoup
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.lib.pagesizes import letter
+from common.fetch import fetch
+from common.fingerprint import skip_unchanged_page
+from common.metrics import begin_run, count, span
+
+begin_run("Addis_Software", "website development companies in A.A")
 
 # Scrape website data
 headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 url = 'https://addissoftware.com/'
-response = requests.get(url, headers=headers)
+response = fetch(url, headers=headers)
 
 if response.status_code == 200:
     print("Page penetrated successfully")
@@ -18,6 +19,13 @@ else:
     print(f"Failed to retrieve the page. Status code: {response.status_code}")
     exit()
 
+# Nothing to do when the company page's content is as it was on the last run
+prints = skip_unchanged_page(
+    'Addis_Software', url, response.text,
+    outputs=[os.path.join("website development companies in A.A", "addis_software_structured.pdf")],
+    container=('article', {'class': 'post-5 page type-page status-publish has-post-thumbnail hentry'}),
+)
+
 soup = BeautifulSoup(response.text, 'html.parser')
 data = []
 
@@ -42,7 +50,11 @@ for item in items:
         'Contact Us': contactus,
     })
 
-# Save data to structured PDF
+# Save data to structured PDF (reportlab is only loaded once there is something to write)
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.lib.pagesizes import letter
+
 output_dir = "website development companies in A.A"
 os.makedirs(output_dir, exist_ok=True)  # Ensure directory exists
 pdf_file = os.path.join(output_dir, "addis_software_structured.pdf")
@@ -63,5 +75,8 @@ for record in data:
     content.append(Spacer(1, 24))
 
 # Build the PDF
-doc.build(content)
+count("items", len(data))
+with span("write"):
+    doc.build(content)
 print(f"Data saved to {pdf_file} successfully.")
+prints.save()
@@ -2,6 +2,13 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os  # To handle directory creation
+from common.pagination import prefetch_pages
+from common.known import KnownIndex
+from common.storage import history_store
+from common.fingerprint import Fingerprints, fingerprint
+from common.metrics import begin_run, count
+
+begin_run("Hellomarketmenshoe", "web-scraping/ecommerce")
 
 # Headers to simulate a real browser request (to avoid anti-scraping measures)
 headers = {
@@ -17,21 +24,28 @@ data = []
 # Path for the output CSV file
 output_path = 'web-scraping/ecommerce/hellomarketyes.csv'
 
-# Load existing data if the file exists
-existing_data = pd.read_csv(output_path) if os.path.exists(output_path) else pd.DataFrame()
-existing_titles = set(existing_data['title']) if not existing_data.empty else set()
+# The history store; titles already in it are looked up once the scrape is done
+store = history_store("Hellomarketmenshoe", output_path, 'title')
+# Titles seen earlier in this run
+known_titles = KnownIndex('title')
+# Digests of the product list on each page, kept between runs
+prints = Fingerprints('Hellomarketmenshoe', store=store)
 
-# Loop through the pages
-for page in range(1, 10):  # Change the range for more pages if necessary
-    url = base_url.format(page=page)
-    
-    # Send the HTTP request with headers
+# Pages are fetched a few ahead of the one being handled; the first missing page ends the crawl
+last_page = 9  # Change for more pages if necessary
+
+for page, pending in prefetch_pages(lambda page: base_url.format(page=page), stop=last_page, headers=headers):
+    # Collect the page's response
     try:
-        response = requests.get(url, headers=headers)
+        response = pending.result()
         response.raise_for_status()  # Raise an exception for HTTP errors (4xx, 5xx)
         print(f"Page {page} fetched successfully!")
+        prints.check(base_url.format(page=page), fingerprint(response.text, ('div', {'class': 'product-layout product-list col-xs-12'})))
     except requests.exceptions.RequestException as e:
-        print(f"Failed to retrieve page {page}. Status code: {response.status_code} - {e}")
+        if e.response is not None and e.response.status_code == 404:
+            print(f"Page {page} does not exist. Stopping scrape.")
+            break
+        print(f"Failed to retrieve page {page}: {e}")
         continue  # Skip this page and continue to the next one
 
     # Parse the content of the page
@@ -51,8 +65,8 @@ for page in range(1, 10):  # Change the range for more pages if necessary
         # Extract description
         description = item.find('p', class_='desc').get_text(strip=True) if item.find('p', class_='desc') else 'No description found'
         
-        # Check if this product is already in the existing data
-        highlight = 'new' if title not in existing_titles else 'existing'
+        # Check if this product already came up in this run
+        highlight = known_titles.mark(title)
         
         # Append data to the list
         data.append({
@@ -62,6 +76,9 @@ for page in range(1, 10):  # Change the range for more pages if necessary
             'highlight': highlight
         })
 
+# Nothing to merge when every page is as it was last time
+prints.exit_if_unchanged()
+
 # Check if data was extracted before proceeding
 if len(data) == 0:
     print("No products found on the page.")
@@ -69,18 +86,19 @@ if len(data) == 0:
 
 # Convert the list of data into a DataFrame
 df = pd.DataFrame(data)
+count("items", len(df))
+
+# Products already in the history are existing as well
+df.loc[store.contains(df), 'highlight'] = 'existing'
 
 # Ensure the target directory exists
 output_dir = os.path.dirname(output_path)
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
-# Save the data to a CSV file, keeping existing data and adding new
-if not existing_data.empty:
-    # Merge new data with existing data
-    df = pd.concat([existing_data, df]).drop_duplicates(subset=['title'], keep='last')
-
-# Save to CSV
-df.to_csv(output_path, index=False)
+# Save the data, keeping existing data and adding new
+# Merge new data into the history store (and CSV), ensuring no duplicate titles
+store.merge(df, status_column=None)
 
-print(f"Scraping completed and data saved to '{output_path}'")
+print(f"Scraping completed and data saved to '{store.location}'")
+prints.save()
@@ -1,7 +1,12 @@
 import os
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
+from common.fetch import fetch
+from common.fingerprint import skip_unchanged_page
+from common.diff import CAPITALISED, merge_history
+from common.metrics import begin_run, count, span
+
+begin_run("baby", "web-scraping/ecommerce")
 
 # URL of the eCommerce product category page
 url = 'https://babyshopet.com/shoes/'
@@ -12,7 +17,7 @@ headers = {
 }
 
 # Send HTTP request to fetch the page content with headers
-response = requests.get(url, headers=headers)
+response = fetch(url, headers=headers)
 
 # Check if the request was successful
 if response.status_code == 200:
@@ -21,6 +26,13 @@ else:
     print(f"Failed to retrieve the page. Status code: {response.status_code}")
     exit()
 
+# Nothing to do when the products are as they were on the last run
+prints = skip_unchanged_page(
+    'baby', url, response.text,
+    outputs=['web-scraping/ecommerce/baby.csv'],
+    container=('li', {'class': 'product'}),
+)
+
 # Parse the content of the page using BeautifulSoup
 soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -49,6 +61,7 @@ for product in products:
 
 # Convert the list of product data into a pandas DataFrame
 df = pd.DataFrame(product_data)
+count("items", len(df))
 
 # Specify the output file path
 output_file = 'web-scraping/ecommerce/baby.csv'
@@ -56,18 +69,17 @@ output_file = 'web-scraping/ecommerce/baby.csv'
 if os.path.exists(output_file):
     existing_df = pd.read_csv(output_file)
     
-    # Merge new data with existing data
-    merged_df = pd.concat([existing_df, df]).drop_duplicates(subset=['link'], keep='last')
-    
-    # Add a column to highlight new and existing data
-    merged_df['status'] = ['New' if link not in existing_df['link'].values else 'Existing' 
-                           for link in merged_df['link']]
+    # Merge new data with existing data, highlighting new, existing and removed entries
+    merged_df, _ = merge_history(existing_df, df, 'link', labels=CAPITALISED)
     
     # Save the updated data back to the file
-    merged_df.to_csv(output_file, index=False)
+    with span("write"):
+        merged_df.to_csv(output_file, index=False)
     print(f"Data updated in '{output_file}' with highlights for new and existing entries.")
 else:
     # Save new data and mark all as 'New'
     df['status'] = 'New'
-    df.to_csv(output_file, index=False)
+    with span("write"):
+        df.to_csv(output_file, index=False)
     print(f"Data saved to '{output_file}' for the first time, all entries marked as 'New'.")
+prints.save()
@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from bench.server import FixtureServer
+from common.fetch import FIXTURE_ENV
+from common.jobs import ALL_JOBS, find_jobs
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(SCRIPTS_DIR)
+CLI = os.path.join(SCRIPTS_DIR, "cli.py")
+
+# Output folders checked into the repo; some scripts write into them without creating them
+OUTPUT_ROOTS = ("eco", "web-scraping", "website development companies in A.A")
+
+# Jobs whose sites have no fixture: Facebook Marketplace needs a login, addissoftware.com is one static brochure page
+NO_FIXTURE = {"eph", "melat", "Addis_Software"}
+
+# Columns compared against a previous run with --compare (higher is better for the rates)
+COMPARED = ("wall_s", "pages_per_s", "items_per_s", "peak_rss_mb")
+
+
+def seed_output_dirs(workdir):
+    """Recreate the repo's output folders (without their files) so every run starts from an empty history."""
+    for root in OUTPUT_ROOTS:
+        for folder, _, _ in os.walk(os.path.join(REPO_DIR, root)):
+            os.makedirs(os.path.join(workdir, os.path.relpath(folder, REPO_DIR)), exist_ok=True)
+
+
+def run_job(job, server, workdir, run=1):
+    """Run one job in a fresh interpreter against the fixture server; return its measurements."""
+    stats = server.reset()
+    env = {**os.environ, FIXTURE_ENV: server.url}
+    with open(os.path.join(workdir, f"{job.name}.{run}.log"), "w", encoding="utf-8") as log:
+        start = time.monotonic()
+        process = subprocess.Popen([sys.executable, CLI, "run", job.name], cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 gives this child's own peak RSS, not the largest of every child so far
+        _, status, usage = os.wait4(process.pid, 0)
+        end = time.monotonic()
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    wall = end - start
+    first = stats.first or end
+    last = stats.last or end
+    return {
+        "job": job.name,
+        "run": run,
+        "exit_code": process.returncode,
+        "wall_s": round(wall, 3),
+        # Stages as the server sees them: interpreter and browser start-up, the fetch window, then merge/analysis/writes
+        "stages": {
+            "startup_s": round(first - start, 3),
+            "fetch_s": round(last - first, 3),
+            "post_s": round(end - last, 3),
+        },
+        "requests": stats.requests,
+        "pages": stats.pages,
+        "not_modified": stats.not_modified,
+        "items": stats.items,
+        "bytes": stats.bytes,
+        "pages_per_s": round(stats.pages / wall, 2) if wall else 0.0,
+        "items_per_s": round(stats.items / wall, 1) if wall else 0.0,
+        "peak_rss_mb": round(usage.ru_maxrss / 1024, 1),
+    }
+
+
+def print_table(results, previous=None):
+    previous = {(r["job"], r["run"]): r for r in (previous or [])}
+    print(f"{'job':<26}{'run':>4}{'exit':>5}{'wall s':>8}{'start':>7}{'fetch':>7}{'post':>7}"
+          f"{'pages':>7}{'items':>7}{'pages/s':>9}{'items/s':>9}{'RSS MB':>8}")
+    for r in results:
+        s = r["stages"]
+        print(f"{r['job']:<26}{r['run']:>4}{r['exit_code']:>5}{r['wall_s']:>8.2f}{s['startup_s']:>7.2f}{s['fetch_s']:>7.2f}"
+              f"{s['post_s']:>7.2f}{r['pages']:>7}{r['items']:>7}{r['pages_per_s']:>9.2f}{r['items_per_s']:>9.1f}{r['peak_rss_mb']:>8.1f}")
+        before = previous.get((r["job"], r["run"]))
+        if before:
+            deltas = ", ".join(
+                f"{key} {100 * (r[key] - before[key]) / before[key]:+.0f}%" for key in COMPARED if before.get(key)
+            )
+            print(f"{'':<30}vs previous: {deltas}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the scrapers offline against a local server replaying their sites.",
+    )
+    parser.add_argument("sites", nargs="*", help="Jobs to benchmark (default: every job with a fixture)")
+    parser.add_argument("--pages", type=int, default=5, help="Pages (or scroll batches) per fixture site")
+    parser.add_argument("--items", type=int, default=24, help="Listings per page")
+    parser.add_argument("--latency", type=float, default=0, help="Added latency per request, in ms")
+    parser.add_argument("--jitter", type=float, default=0, help="Random +/- jitter on that latency, in ms")
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per job in the same directory (later runs merge into history)")
+    parser.add_argument("--captures", help="Directory of saved pages (<host>/<quoted path>.html) served before the synthetic ones")
+    parser.add_argument("--workdir", help="Where scrapers write their outputs and logs (default: a temporary directory)")
+    parser.add_argument("--out", default="bench-results.json", help="JSON file the results are written to")
+    parser.add_argument("--compare", help="Earlier results file to print deltas against")
+    args = parser.parse_args(argv)
+
+    try:
+        jobs = find_jobs(args.sites, [job for job in ALL_JOBS if job.name not in NO_FIXTURE])
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    previous = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            previous = json.load(f)["results"]
+
+    root = args.workdir or tempfile.mkdtemp(prefix="scrape-bench-")
+    results = []
+    with FixtureServer(args.pages, args.items, args.latency, args.jitter, captures=args.captures) as server:
+        for job in jobs:
+            workdir = os.path.join(root, job.name)
+            seed_output_dirs(workdir)
+            for run in range(1, args.repeat + 1):
+                result = run_job(job, server, workdir, run)
+                results.append(result)
+                print(f"[{job.name}] run {run}: {result['items']} items in {result['wall_s']:.2f}s (exit {result['exit_code']})")
+
+    print()
+    print_table(results, previous)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump({
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": sys.version.split()[0],
+            "settings": {"pages": args.pages, "items": args.items, "latency_ms": args.latency, "jitter_ms": args.jitter},
+            "results": results,
+        }, f, indent=2)
+    print(f"\nResults saved to '{args.out}', outputs and logs in '{root}'.")
+    return 1 if any(r["exit_code"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,274 @@
+import json
+import random
+import re
+from html import escape
+from urllib.parse import parse_qsl
+
+# Default path of a feed's batch requests; sites override it with their real API path
+FEED_PATH = "/__feed"
+
+# Fetches the next batch as JSON from the feed path whenever the page is scrolled near the
+# bottom and renders it client-side, the way jiji and mekina load more listings
+FEED_JS = """
+<script>
+(() => {
+  let offset = %(offset)d, loading = false;
+  const total = %(total)d, container = document.getElementById("feed");
+  window.addEventListener("scroll", async () => {
+    if (loading || offset >= total) return;
+    if (window.innerHeight + window.scrollY < document.body.scrollHeight - 200) return;
+    loading = true;
+    const response = await fetch("%(feed)s?offset=" + offset);
+    container.insertAdjacentHTML("beforeend", (await response.json()).html);
+    offset = Math.min(total, offset + %(batch)d);
+    loading = false;
+  });
+})();
+</script>
+"""
+
+PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>%(title)s</title>
+<style>body{margin:0} .card{height:320px}</style></head>
+<body>%(body)s</body></html>
+"""
+
+WORDS = (
+    "Leather", "Sneaker", "Boot", "Sofa", "Laptop", "HP", "EliteBook", "Perfume", "Shampoo", "Crayons",
+    "Kids", "Classic", "Sport", "Premium", "Original", "Black", "White", "Brown", "Set", "Pack",
+)
+
+
+class Listing:
+    __slots__ = ("ident", "title", "price", "description", "location")
+
+    def __init__(self, ident, title, price, description, location):
+        self.ident = ident
+        self.title = title
+        self.price = price
+        self.description = description
+        self.location = location
+
+
+class Catalog:
+    """Deterministic listings for one fixture site: the same run parameters always serve the same pages."""
+
+    def __init__(self, host, pages, per_page):
+        self.host = host
+        self.pages = pages
+        self.per_page = per_page
+
+    @property
+    def total(self):
+        return self.pages * self.per_page
+
+    def listing(self, index):
+        rng = random.Random(f"{self.host}:{index}")
+        title = " ".join(rng.sample(WORDS, 4))
+        return Listing(
+            ident=100000 + index,
+            title=f"{title} {index}",
+            price=rng.randrange(150, 95000, 50),
+            description=" ".join(rng.choices(WORDS, k=12)).lower(),
+            location=rng.choice(("Bole", "Piassa", "Megenagna", "Merkato", "CMC")),
+        )
+
+    def page(self, number):
+        start = (number - 1) * self.per_page
+        return [self.listing(index) for index in range(start, start + self.per_page)]
+
+    def slice(self, offset, count):
+        return [self.listing(index) for index in range(offset, min(self.total, offset + count))]
+
+
+def _etb(price):
+    return f"ETB {price:,}"
+
+
+def _page_number(path, query, param="page"):
+    match = re.search(r"/page/(\d+)/?", path)
+    if match:
+        return int(match.group(1))
+    return int(dict(parse_qsl(query)).get(param, 1) or 1)
+
+
+class Site:
+    """One fixture host: turns a request path and query into (status, html, items served)."""
+
+    def __init__(self, host, title_tag="h3"):
+        self.host = host
+        self.title_tag = title_tag
+
+    def render(self, catalog, path, query):
+        number = _page_number(path, query)
+        if not 1 <= number <= catalog.pages:
+            return 404, PAGE % {"title": "Not found", "body": "<h1>Page not found</h1>"}, 0
+        listings = catalog.page(number)
+        body = self.listings(listings) + self.pagination(path, query, number, catalog.pages)
+        return 200, PAGE % {"title": self.host, "body": body}, len(listings)
+
+    def listings(self, listings):
+        raise NotImplementedError
+
+    def pagination(self, path, query, number, pages):
+        return ""
+
+
+class WooCommerce(Site):
+    """addisber, dagicomputers, babyshopet: li.product / div.product-inner cards, /page/N/ pagination."""
+
+    def listings(self, listings):
+        cards = "".join(
+            f'<li class="product"><div class="product-inner">'
+            f'<a href="https://{self.host}/product/item-{item.ident}/">'
+            f'<{self.title_tag} class="woocommerce-loop-product__title woo-loop-product__title">{escape(item.title)}</{self.title_tag}></a>'
+            f'<span class="price"><span class="woocommerce-Price-amount amount">{_etb(item.price)}</span></span>'
+            f'</div></li>'
+            for item in listings
+        )
+        return f'<ul class="products">{cards}</ul>'
+
+    def pagination(self, path, query, number, pages):
+        base = re.sub(r"page/\d+/?", "", path).rstrip("/")
+        links = "".join(
+            f'<a class="page-numbers current">{page}</a>' if page == number
+            else f'<a class="page-numbers" href="https://{self.host}{base}/page/{page}/?{query}">{page}</a>'
+            for page in range(max(1, number - 2), min(pages, number + 2) + 1)
+        )
+        return f'<nav class="woocommerce-pagination">{links}</nav>'
+
+
+class Geez(Site):
+    def listings(self, listings):
+        return "".join(
+            f'<div class="product-item"><a href="https://{self.host}/product/{item.ident}/">'
+            f'<h2 class="product-title">{escape(item.title)}</h2></a><span class="price">{_etb(item.price)}</span></div>'
+            for item in listings
+        )
+
+
+class HelloMarket(Site):
+    def listings(self, listings):
+        return "".join(
+            f'<div class="product-layout product-list col-xs-12"><div class="product-thumb">'
+            f'<a href="https://{self.host}/index.php?route=product/product&amp;path=99_86&amp;product_id={item.ident}">{escape(item.title)}</a>'
+            f'<p class="desc">{escape(item.description)}</p><p class="price">{_etb(item.price)}</p></div></div>'
+            for item in listings
+        )
+
+
+class Engocha(Site):
+    """Seller pages and classified lists: listingcolumn cards inside #listingslist, a "Next »" link."""
+
+    def listings(self, listings):
+        cards = "".join(
+            f'<div class="col-md-12 listingcolumn normal fourcolumn">'
+            f'<a href="https://{self.host}/classifieds/{item.ident}-{item.title.lower().replace(" ", "-")}?utm_source=store&amp;utm_position={item.ident % 24}">'
+            f'<span class="listingtitle">{escape(item.title)}</span></a>'
+            f'<span class="price">{_etb(item.price)}</span><div class="row smalldesc">{escape(item.description)}</div>'
+            f'<div class="attrib cond new">New</div><span class="location">{item.location}</span></div>'
+            for item in listings
+        )
+        return f'<div id="listingslist">{cards}</div>'
+
+    def pagination(self, path, query, number, pages):
+        if number >= pages:
+            return ""
+        return f'<ul class="pagination"><li><a href="https://{self.host}{path}?page={number + 1}">Next »</a></li></ul>'
+
+
+class Ubuy(Site):
+    def listings(self, listings):
+        return "".join(
+            f'<div class="col-lg-3 col-md-4 col-sm-6 col-12 p-0 listing-product"><a href="https://{self.host}/en/product/{item.ident}">'
+            f'<h3 class="product-title m-0 mt-2">{escape(item.title)}</h3><h3 class="product-price m-0 mt-2">{_etb(item.price)}</h3></a></div>'
+            for item in listings
+        )
+
+    def pagination(self, path, query, number, pages):
+        if number >= pages:
+            return ""
+        return f'<a rel="next" href="https://{self.host}{path}?page={number + 1}">Next</a>'
+
+
+class Feed(Site):
+    """Infinite scroll: the first batch renders with the page, the rest arrive as JSON from feed_path on scroll.
+
+    Each JSON batch carries the site's API records next to the rendered cards,
+    so scrapers can read either the payload or the DOM.
+    """
+
+    feed_path = FEED_PATH
+
+    def render(self, catalog, path, query):
+        if path == self.feed_path:
+            offset = int(dict(parse_qsl(query)).get("offset", 0))
+            listings = catalog.slice(offset, catalog.per_page)
+            payload = {"html": self.listings(listings), **self.payload(listings, offset, catalog.total)}
+            return 200, json.dumps(payload), len(listings)
+        listings = catalog.slice(0, catalog.per_page)
+        script = FEED_JS % {"offset": len(listings), "total": catalog.total, "feed": self.feed_path, "batch": catalog.per_page}
+        body = f'<div id="feed">{self.listings(listings)}</div>{script}'
+        return 200, PAGE % {"title": self.host, "body": body}, len(listings)
+
+
+class Jiji(Feed):
+    feed_path = "/api_web/v1/listing"
+
+    def advert_url(self, item):
+        return f'/addis-ababa/shoes/{item.title.lower().replace(" ", "-")}-{item.ident:0>8}ABCDEFGHabcd.html'
+
+    def payload(self, listings, offset, total):
+        adverts = [
+            {
+                "id": item.ident,
+                "title": item.title,
+                "price_obj": {"value": item.price, "view": _etb(item.price)},
+                "short_description": item.description,
+                "region_name": item.location,
+                "url": f"{self.advert_url(item)}?page=1&pos={item.ident % 20}",
+            }
+            for item in listings
+        ]
+        end = offset + len(listings)
+        return {"adverts_list": {"adverts": adverts}, "next_url": f"{self.feed_path}?offset={end}" if end < total else None}
+
+    def listings(self, listings):
+        return "".join(
+            f'<div class="masonry-item card"><a href="{self.advert_url(item)}?page=1&amp;pos={item.ident % 20}&amp;ads_per_page=20">'
+            f'<div class="b-advert-title-inner">{escape(item.title)}</div><div class="qa-advert-price">{_etb(item.price)}</div>'
+            f'<div class="b-list-advert-base__description-text">{escape(item.description)}</div>'
+            f'<span class="b-list-advert__region__text">{item.location}</span></a></div>'
+            for item in listings
+        )
+
+
+class Mekina(Feed):
+    feed_path = "/api/v1/cars/search"
+
+    def payload(self, listings, offset, total):
+        cars = [{"id": item.ident, "title": item.title, "year": 2000 + item.ident % 25, "price": item.price} for item in listings]
+        end = offset + len(listings)
+        return {"data": cars, "next_cursor": end if end < total else None}
+
+    def listings(self, listings):
+        return "".join(
+            f'<a class="cur card" href="/cars/{item.ident}"><div class="text-sm">{escape(item.title)}</div>'
+            f'<div class="text-disabled">{2000 + item.ident % 25}</div>'
+            f'<div class="flex flex-col justify-between bg-primary-main">{_etb(item.price)}</div></a>'
+            for item in listings
+        )
+
+
+# Every host the scrapers visit that has a fixture; Facebook Marketplace (eph, melat) needs a login and has none
+SITES = {
+    "addisber.com": WooCommerce("addisber.com", title_tag="h3"),
+    "dagicomputers.com": WooCommerce("dagicomputers.com", title_tag="h2"),
+    "babyshopet.com": WooCommerce("babyshopet.com", title_tag="h2"),
+    "geezshop.com": Geez("geezshop.com"),
+    "helloomarket.com": HelloMarket("helloomarket.com"),
+    "engocha.com": Engocha("engocha.com"),
+    "www.ubuy.et": Ubuy("www.ubuy.et"),
+    "jiji.com.et": Jiji("jiji.com.et"),
+    "www.mekina.net": Mekina("www.mekina.net"),
+}
@@ -0,0 +1,137 @@
+import hashlib
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import quote, urlsplit
+
+from bench.fixtures import SITES, Catalog
+
+
+class Stats:
+    """What the server handed out during one scraper run."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.pages = 0
+        self.items = 0
+        self.bytes = 0
+        self.not_found = 0
+        self.not_modified = 0
+        self.first = None
+        self.last = None
+
+    def record(self, status, size, items):
+        now = time.monotonic()
+        with self.lock:
+            self.requests += 1
+            self.bytes += size
+            if status == 200:
+                self.pages += 1
+                self.items += items
+            elif status == 304:
+                self.not_modified += 1
+            else:
+                self.not_found += 1
+            self.first = self.first or now
+            self.last = now
+
+
+class FixtureServer:
+    """Local HTTP server replaying the scraped sites under /<host>/<path>, with injected latency.
+
+    Pages come from `captures/<host>/<quoted path and query>.html` when such a
+    capture exists, otherwise from the synthetic templates in bench.fixtures.
+    """
+
+    def __init__(self, pages=5, per_page=24, latency_ms=0, jitter_ms=0, captures=None, seed=0):
+        self.pages = pages
+        self.per_page = per_page
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.captures = captures
+        self.random = random.Random(seed)
+        self.stats = Stats()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def url(self):
+        host, port = self.httpd.server_address
+        return f"http://{host}:{port}"
+
+    def reset(self):
+        self.stats = Stats()
+        return self.stats
+
+    def delay(self):
+        if self.latency_ms or self.jitter_ms:
+            jitter = self.random.uniform(-self.jitter_ms, self.jitter_ms)
+            time.sleep(max(0.0, self.latency_ms + jitter) / 1000)
+
+    def capture_path(self, host, target):
+        if not self.captures:
+            return None
+        path = os.path.join(self.captures, host, quote(target, safe="") + ".html")
+        return path if os.path.exists(path) else None
+
+    def respond(self, host, target):
+        captured = self.capture_path(host, target)
+        if captured:
+            with open(captured, encoding="utf-8") as f:
+                return 200, f.read(), 0
+        site = SITES.get(host)
+        if site is None:
+            return 404, f"No fixture for {host}", 0
+        parts = urlsplit(target)
+        return site.render(Catalog(host, self.pages, self.per_page), parts.path or "/", parts.query)
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                _, host, target = self.path.split("/", 2) if self.path.count("/") >= 2 else ("", "", "")
+                server.delay()
+                status, html, items = server.respond(host, "/" + target)
+                body = html.encode("utf-8")
+                # Validators like a real origin's, so repeated runs exercise the scrapers' HTTP cache
+                etag = '"%s"' % hashlib.sha1(body).hexdigest()[:16]
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    status, body, items = 304, b"", 0
+                self.send_response(status)
+                if status == 200:
+                    self.send_header("ETag", etag)
+                if status != 304:
+                    # Feed batches are JSON, everything else is a page
+                    content_type = "application/json" if html.startswith("{") else "text/html; charset=utf-8"
+                    self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                server.stats.record(status, len(body), items)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
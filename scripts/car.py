@@ -1,9 +1,43 @@
-from playwright.sync_api import sync_playwright
-import time
 import pandas as pd
 import os
-
-def scrape_page(url):
+import re
+from common.browser import launch_browser, new_context
+from common.capture import JsonFeed, ResponseCapture
+from common.diff import CAPITALISED
+from common.fingerprint import Fingerprints, rows_fingerprint
+from common.storage import history_store
+from common.scroll import ScrollSession
+from common.metrics import instrumented
+
+# Fields read from each car card (adjust selectors as needed)
+LISTING_FIELDS = {
+    'title': ('div.text-sm', 'textContent'),
+    'year': ('div.text-disabled', 'textContent'),
+    'price': ('div.flex.flex-col.justify-between.bg-primary-main', 'textContent'),
+}
+LISTING_DEFAULTS = {'title': 'No title found', 'year': 'No year found', 'price': 'No price found'}
+
+# The search API the page pulls more cars from as it scrolls; its records give the exact price
+MEKINA_API = JsonFeed(r"mekina\.net/api/v1/cars", {'title': 'title', 'year': 'year', 'price': 'price'})
+
+
+def car_year(value):
+    """The model year as a number, from the API's 2017 or the card's '2017 | Diesel'; anything else as it is."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    found = re.search(r"\b(?:19|20)\d\d\b", str(value))
+    return int(found.group()) if found else value
+
+
+def car_price(value):
+    """The amount as a number, from the API's 4100000 or the card's 'ETB 4,100,000 (Negotiable)'; anything else as it is."""
+    if isinstance(value, (int, float)):
+        return int(value)
+    found = re.search(r"\d[\d,]*", str(value))
+    return int(found.group().replace(",", "")) if found else value
+
+
+def scrape_page(browser, url):
     # Define the output file path directly
     output_file = 'web-scraping/ecommerce/car_listings.csv'
     
@@ -15,76 +49,56 @@ def scrape_page(url):
     # General user-agent string representing a recent version of Chrome
     user_agent = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
 
-    with sync_playwright() as p:
-        # Set the user agent during browser launch
-        browser = p.chromium.launch(headless=True, args=[f"--user-agent={user_agent}"])
-        page = browser.new_page()
+    # Set the user agent on our own context so it doesn't leak into other scrapers
+    with new_context(browser, "car", user_agent=user_agent) as context:
+        page = context.new_page()
 
-        # Navigate to the URL
+        # Listen for the search API before navigating, then go to the URL
+        capture = ResponseCapture(page, MEKINA_API)
         page.goto(url)
 
         # Wait for the page content to load (adjust selector as needed)
         page.wait_for_selector('a.cur', timeout=10000)  # Wait for the car listings
 
-        # Scroll to load all content (adjust number of scrolls as necessary)
-        for _ in range(5):  # Adjust the number of scrolls
-            page.evaluate('window.scrollBy(0, window.innerHeight);')
-            time.sleep(2)  # Wait for content to load
-
-        # Extract all car listings
-        listings = page.query_selector_all('a.cur')  # Select all anchor tags containing car info
+        # Scroll to load all content (adjust max_scrolls as necessary); each batch comes from the API's JSON
+        # when it was captured and from the rendered car cards (a.cur) otherwise
+        session = ScrollSession(page, 'a.cur', LISTING_FIELDS, defaults=LISTING_DEFAULTS, max_scrolls=5)
+        listings = [listing for batch in session.batches(capture) for listing in batch]
 
         print(f"Found {len(listings)} listings.")  # Debugging output
 
-        # List to store the extracted data
-        product_data = []
-
-        # Loop through each listing and extract the details
-        for listing in listings:
-            # Extract car title
-            title = listing.query_selector('div.text-sm')  # Adjust selector for car title
-            title_text = title.text_content().strip() if title else 'No title found'
-
-            # Extract car year (if present)
-            year = listing.query_selector('div.text-disabled')  # Adjust selector for car year
-            year_text = year.text_content().strip() if year else 'No year found'
+        # List to store the extracted data; year and price are reduced to numbers so cars read from the API
+        # and from the cards are written (and matched against the history) the same way
+        product_data = [
+            {'title': listing['title'], 'year': car_year(listing['year']), 'price': car_price(listing['price'])}
+            for listing in listings
+        ]
 
-            # Extract car price
-            price = listing.query_selector('div.flex.flex-col.justify-between.bg-primary-main')  # Adjust selector for price
-            price_text = price.text_content().strip() if price else 'No price found'
-
-            # Add extracted data to the list
-            product_data.append({
-                'title': title_text,
-                'year': year_text,
-                'price': price_text
-            })
+        # Nothing to merge when the same cars came up as on the last run
+        store = history_store("car", output_file, ['title', 'year', 'price'])
+        prints = Fingerprints("car", store=store)
+        prints.check(url, rows_fingerprint(product_data))
+        if prints.up_to_date():
+            return
 
         # Convert the data to a pandas DataFrame
         new_df = pd.DataFrame(product_data)
 
-        # Check if the CSV file already exists
-        if os.path.exists(output_file):
-            existing_df = pd.read_csv(output_file)
-            # Combine new data with existing data and remove duplicates based on car details
-            combined_df = pd.concat([existing_df, new_df]).drop_duplicates(subset=['title', 'year', 'price'], keep='last')
-
-            # Highlight new and existing data
-            combined_df['status'] = combined_df.apply(
-                lambda row: 'New' if row.name >= len(existing_df) else 'Existing', axis=1
-            )
-        else:
-            combined_df = new_df
-            combined_df['status'] = 'New'
+        # Combine new data with the saved history on the car details and highlight new and existing cars;
+        # the combined data goes to the history store (and CSV file)
+        store.merge(new_df, labels=CAPITALISED)
 
-        # Save the combined data to the CSV file
-        combined_df.to_csv(output_file, index=False)
+        print(f"Scraping completed. Data saved to '{store.location}'.")
+        prints.save()
 
-        # Close the browser
-        browser.close()
+# URL of the page to scrape
+url = 'https://www.mekina.net/cars/search?bodyType=pickup'  # Replace with the actual URL
 
-        print(f"Scraping completed. Data saved to '{output_file}'.")
+@instrumented("car", "web-scraping/ecommerce")
+def scrape(browser):
+    scrape_page(browser, url)
 
 # Call the function with the URL of the page
-url = 'https://www.mekina.net/cars/search?bodyType=pickup'  # Replace with the actual URL
-scrape_page(url)
+if __name__ == "__main__":
+    with launch_browser() as browser:
+        scrape(browser)
@@ -0,0 +1,108 @@
+import argparse
+import os
+import runpy
+import sys
+import time
+import traceback
+
+from common.jobs import ALL_JOBS, KINDS, find_jobs, job_kind
+from common.metrics import finish_run
+
+
+def run_scripts(jobs):
+    """Run plain requests scripts one after another in this process; return the names that failed."""
+    failed = []
+    for job in jobs:
+        start = time.monotonic()
+        try:
+            runpy.run_path(os.path.join(os.path.dirname(os.path.abspath(__file__)), f"{job.module}.py"), run_name="__main__")
+        except SystemExit as e:
+            finish_run(e)
+            # The scripts exit() early when a page is missing or empty; only a non-zero code is a failure
+            if e.code not in (None, 0):
+                failed.append(job.name)
+                print(f"[{job.name}] exited with {e.code}")
+                continue
+        except Exception as e:
+            finish_run(e)
+            failed.append(job.name)
+            print(f"[{job.name}] failed:\n{traceback.format_exc()}")
+            continue
+        else:
+            # Scripts record themselves with begin_run; close each report before the next script starts
+            finish_run()
+        print(f"[{job.name}] finished in {time.monotonic() - start:.1f}s")
+    return failed
+
+
+def list_jobs(args):
+    for job in ALL_JOBS:
+        print(f"{job.name:<26} {job_kind(job)}")
+    return 0
+
+
+def run(args):
+    if args.no_block:
+        os.environ["SCRAPE_BLOCK_RESOURCES"] = "0"
+    jobs = find_jobs(args.sites, ALL_JOBS)
+    if args.kind:
+        jobs = [job for job in jobs if job_kind(job) == args.kind]
+
+    failed = run_scripts([job for job in jobs if job.entry is None])
+    browser_jobs = [job for job in jobs if job.entry is not None]
+    if browser_jobs:
+        # Playwright (and the pandas-heavy browser scrapers) only load when a browser job is selected
+        from common.runner import run_jobs
+        failed += run_jobs(browser_jobs, max_workers=args.jobs)
+    return 1 if failed else 0
+
+
+def imports(args):
+    from common.importtime import import_report, interpreter_baseline
+
+    baseline = interpreter_baseline()
+    over = []
+    for job in find_jobs(args.sites, ALL_JOBS):
+        report = import_report(job.module, baseline, top=args.top)
+        if report.error:
+            print(f"{job.name:<26} could not be imported: {report.error}")
+            over.append(job.name)
+            continue
+        heaviest = ", ".join(f"{name} {ms:.0f}ms" for name, ms in report.top)
+        print(f"{job.name:<26} {report.total_ms:7.0f}ms  {heaviest}")
+        if args.budget is not None and report.total_ms > args.budget:
+            over.append(job.name)
+    if over and args.budget is not None:
+        print(f"Over the {args.budget:.0f}ms import budget or unimportable: {', '.join(over)}")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the scrapers and check how long they take to start.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    commands.add_parser("list", help="List every registered job").set_defaults(func=list_jobs)
+
+    run_parser = commands.add_parser("run", help="Run jobs; browser jobs share one Chromium")
+    run_parser.add_argument("sites", nargs="*", help="Job names to run (default: all registered jobs)")
+    run_parser.add_argument("--jobs", "-j", type=int, default=4, help="Maximum number of browser sites scraped at once")
+    run_parser.add_argument("--kind", choices=KINDS, help="Only run jobs of this kind")
+    run_parser.add_argument("--no-block", action="store_true", help="Load images, fonts, media and trackers instead of blocking them")
+    run_parser.set_defaults(func=run)
+
+    imports_parser = commands.add_parser("imports", help="Report each job's cold import time (python -X importtime)")
+    imports_parser.add_argument("sites", nargs="*", help="Job names to measure (default: all registered jobs)")
+    imports_parser.add_argument("--top", type=int, default=3, help="Heaviest imports to show per job")
+    imports_parser.add_argument("--budget", type=float, help="Exit non-zero if a job takes longer than this many ms to import")
+    imports_parser.set_defaults(func=imports)
+
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,243 @@
+import numpy as np
+import pandas as pd
+
+from common.metrics import span
+
+# Report order; price_buckets labels every product with one of these
+BUCKETS = ("High", "Mid", "Low")
+
+# Advice printed under the report for every bucket that has products, in English and Amharic
+TREND_SECTIONS = {
+    "High": (
+        "1. High Price Bar (Premium Products)\n"
+        "English:\n"
+        "- Trend: Luxury and exclusivity are in demand. Consumers are paying for quality and status.\n"
+        "- Action: Focus on exclusive launches and personalized experiences. Provide top-tier customer service and innovative offerings.\n"
+        "Amharic:\n"
+        "የቅንጦት እና የኤክስክሉስቭ ምርቶች ተፈላጊ ናቸው። ተጠቃሚዋች ለጥራት እና ደረጃ ምርቶች እየከፈሉ ነው።\n"
+        "Actions:\n"
+        "ትኩረት በ ልዩ ጅምሮች እና ግላዊ ተሞክሮዎች ላይ ያተኩሩ። ከፍተኛ-ደረጃ የደንበኞች አገልግሎት እና የፈጠራ አቅርቦቶች ያቅርቡ\n"
+        "\n"
+    ),
+    "Mid": (
+        "2. Mid Price Bar (Affordable Quality Products)\n"
+        "English:\n"
+        "- Trend: Consumers are seeking good value for their money, especially during economic uncertainty. Discounts and promotions drive purchases.\n"
+        "- Action: Highlight value-for-money and use seasonal sales and bundle offers to stay competitive.\n"
+        "Amharic:\n"
+        "ተጠቃሚዎች ለገንዘባቸው ጥሩ ዋጋ ይፈልጋሉ ፣ በተለይም በኢኮኖሚያዊ አለመረጋጋት ወቅት። ቅናሾች እና ማስተዋወቂያዎች ግዥዎችን ይኖር።\n"
+        "Action:\n"
+        "በዋጋ-ለገንዘብ ላይ ያተኩሩ እና ወቅታዊ ሽያጮችን ይጠቀሙ እና ተወዳዳሪ ሆነው ለመቆየት የጥቅል አቅርቦቶችን ይጠቀሙ።\n"
+        "\n"
+    ),
+    "Low": (
+        "3. Low Price Bar (Budget Products)\n"
+        "English:\n"
+        "- Trend: Budget-conscious consumers are looking for affordable and quick deals. Flash sales and time-limited offers dominate buying behavior.\n"
+        "- Action: Focus on frequent flash sales and loyalty programs to create urgency and retain customers.\n"
+        "Amharic:\n"
+        "የበጀት ግንዛቤ ያላቸው ተጠቃሚዋች ተመጣጣኝ እና ፈጣን ስምምነቶችን ይፈልጋሉ። የፍላሽ ሽያጭ እና በጊዜ የተገደቡ ቅናሾች ላይ ያተኩሩ.\n"
+        "Action:\n"
+        "አስቸኳይ ሁኔታ ለመፍጠር እና ደንበኞችን ለማቆየት በ ተደጋጋሚ የፍላሽ ሽያጭ እና የታማኝነት ፕሮግራሞች ላይ ያተኩሩ\n"
+    ),
+}
+
+# Advice for buckets holding more than RECOMMENDATION_SHARES of all products
+RECOMMENDATION_SECTIONS = {
+    "High": (
+        "1. High Price Bar (Premium Products)\n"
+        "English:\n"
+        "- Attract Customers:\n"
+        "  - Offer exclusive deals like limited editions or early access to special collections. This makes the product feel unique and worth the higher price.\n"
+        "- Stay Competitive:\n"
+        "  - Provide excellent customer service (fast responses, easy returns) to justify the premium price.\n"
+        "  - Regularly release new and innovative products to keep customers interested and excited.\n"
+        "Amharic:\n"
+        "ደንበኞችን ይሳቡ:\n"
+        "- እንደ ውስን እትሞች ወይም የልዩ ስብስቦች ቀደምት መዳረሻ ያሉ ልዩ ቅናሾችን ያቅርቡ። ይህ ምርቱ ልዩ እና ከፍተኛ ዋጋ ያለው እንዲሰማው ያደርገዋል.\n"
+        "- ተወዳዳሪ ሁን:\n"
+        "  - የፕሪሚየም ዋጋን ትክክለኛነት ለማረጋገጥ እጅግ በጣም ጥሩ የደንበኞች አገልግሎት  (ፈጣን ምላሾች ፣ ቀላል ተመላሾች) ያቅርቡ።\n"
+        "\n"
+    ),
+    "Mid": (
+        "2. Mid Price Bar (Affordable Quality Products)\n"
+        "English:\n"
+        "- Attract Customers:\n"
+        "  - Emphasize value for money—show customers they get great quality at a fair price. Offer discounts or free shipping to make the deal even better.\n"
+        "- Stay Competitive:\n"
+        "  - Keep your prices competitive by checking competitors regularly and adjusting as needed.\n"
+        "  - Offer bundles (e.g., buy one get one free) to increase perceived value.\n"
+        "Amharic:\n"
+        "ደንበኞችን ይሳቡ:\n"
+        "- አጽንኦት ይስጡ ለገንዘብ ዋጋ ደንበኛው በተመጣጣኝ ዋጋ ጥሩ ጥራት እንደሚያገኙ አሳይ። ስምምነቱን የበለጠ የተሻለ ለማድረግ ቅናሾች ወይም ነፃ መላኪያ ያቅርቡ።\n"
+        "- ተወዳዳሪ ሁን:\n"
+        "  - ተፎካካሪዎችን በመደበኛነት በመፈተሽ እና እንደ አስፈላጊነቱ በማስተካከል ዋጋዎችዎን ተወዳዳሪ ያድርጉ.\n"
+        "  - የታሰበውን እሴት ለመጨመር ጥቅሎች  (ለምሳሌ ፣ አንድ ይግዙ ነፃ) ያቅርቡ።\n"
+        "\n"
+    ),
+    "Low": (
+        "3. Low Price Bar (Budget Products)\n"
+        "English:\n"
+        "- Attract Customers:\n"
+        "  - Run flash sales (limited-time discounts) to create urgency and encourage quick purchases.\n"
+        "  - Use time-limited offers to make customers feel they’re getting a great deal that won’t last.\n"
+        "- Stay Competitive:\n"
+        "  - Reduce costs by negotiating with suppliers for lower prices or using more efficient methods.\n"
+        "  - Reward repeat customers with loyalty programs (e.g., discounts on next purchase).\n"
+        "Amharic:\n"
+        "ደንበኞችን ይሳቡ:\n"
+        "- አስቸኳይ ሁኔታን ለመፍጠር እና ፈጣን ግዢዎችን ለማበረታታት የፍላሽ ሽያጮችን ይወገዱ (የተገደበ ጊዜ ቅናሾች).\n"
+        "- ደንበኞች የማይዘልቅ ትልቅ ነገር እያገኙ እንደሆነ እንዲሰማቸው ለማድረግ ጊዜ-የተገደበ ቅናሾችን ይጠቀሙ.\n"
+        "- ተወዳዳሪ ሁን:\n"
+        "  - ወጪን ይቀንሱ ከአቅራቢዎች ጋር በዝቅተኛ ዋጋ በመደራደር ወይም ይበልጥ ቀልጣፋ ዘዴዎችን በመጠቀም.\n"
+        "  - ተደጋጋሚ ደንበኞችን በ የታማኝነት ፕሮግራሞች ይሸልሙ (ለምሳሌ ፣ በሚቀጥለው ግዢ ላይ ቅናሾች)።\n"
+    ),
+}
+
+RECOMMENDATION_SHARES = {"High": 0.3, "Mid": 0.4, "Low": 0.3}
+
+
+def numeric_prices(prices):
+    """Prices as floats; text such as 'ETB 3,600' is cleaned and anything unparseable becomes NaN."""
+    if pd.api.types.is_numeric_dtype(prices):
+        return prices.astype(float)
+    cleaned = prices.astype(str).str.replace("ETB", "", regex=False).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def price_buckets(prices):
+    """Label each price Low, Mid or High in one vectorised pass (NaN for missing prices).
+
+    The edges are the quarter points of the price range, as the reports have
+    always used: Low up to the first quarter, Mid up to the half, High above.
+    """
+    prices = numeric_prices(prices)
+    low, high = prices.min(), prices.max()
+    edges = [low + i * (high - low) // 4 for i in range(5)]
+    codes = np.digitize(prices.to_numpy(), [edges[1], edges[2]], right=True)
+    labels = np.array(["Low", "Mid", "High"], dtype=object)[np.minimum(codes, 2)]
+    labels[prices.isna().to_numpy()] = np.nan
+    return pd.Series(labels, index=prices.index)
+
+
+def bucket_counts(buckets):
+    counts = buckets.value_counts()
+    return {name: int(counts.get(name, 0)) for name in BUCKETS}
+
+
+@span("analysis")
+def write_trend_report(path, data, price="Price", title="Title", link="Link", sections=None):
+    """Write the trend report: bucket sizes, every product line per bucket, then advice per bucket.
+
+    Product lines are built as one vectorised string column and streamed to the
+    file, so the report's cost is linear in the number of rows. `sections`
+    replaces individual entries of TREND_SECTIONS for scripts with their own wording.
+    """
+    sections = {**TREND_SECTIONS, **(sections or {})}
+    with open(path, "w", encoding="utf-8") as out:
+        out.write("Trend Analysis for Price Ranges\n\n")
+        if data.empty:
+            out.write("No data available for analysis.\n")
+            return
+        if numeric_prices(data[price]).isna().all():
+            out.write("No valid price data available for analysis.\n")
+            return
+
+        buckets = price_buckets(data[price])
+        counts = bucket_counts(buckets)
+        for name in BUCKETS:
+            out.write(f"Number of {name} Price Products: {counts[name]}\n")
+        out.write("\n")
+
+        lines = (
+            "- Title: " + data[title].astype(str)
+            + ", Price: " + data[price].astype(str)
+            + ", Link: " + data[link].astype(str) + "\n"
+        )
+        for name in BUCKETS:
+            if counts[name]:
+                out.write(f"{name} Price Products (Titles, Prices, Links):\n")
+                out.writelines(lines[buckets == name].tolist())
+                out.write("\n")
+
+        for name in BUCKETS:
+            if counts[name]:
+                out.write(sections[name])
+
+
+@span("analysis")
+def write_recommendations(path, data, price="Price", sections=None, shares=RECOMMENDATION_SHARES):
+    """Write the recommendations for buckets that hold more than their share of all products."""
+    sections = {**RECOMMENDATION_SECTIONS, **(sections or {})}
+    with open(path, "w", encoding="utf-8") as out:
+        if data.empty:
+            out.write("No price data available for analysis.\n")
+            return
+        counts = bucket_counts(price_buckets(data[price]))
+        out.write("Recommendations & Suggestions Based on Data Visualization\n\n")
+        for name in BUCKETS:
+            if counts[name] > len(data) * shares[name]:
+                out.write(sections[name])
+
+
+@span("analysis")
+def write_range_summary(path, data, price="price"):
+    """Write the short summary: how many products fall in each bucket and which bucket dominates."""
+    counts = bucket_counts(price_buckets(data[price]))
+    if counts["High"] > counts["Mid"] and counts["High"] > counts["Low"]:
+        decision = "High-priced items are more frequent, indicating a potential demand surge in premium products."
+    elif counts["Mid"] > counts["Low"]:
+        decision = "Mid-range items dominate, indicating growing popularity in this price range."
+    else:
+        decision = "Low-priced items dominate, suggesting that affordability is a key factor in popularity."
+    with open(path, "w", encoding="utf-8") as out:
+        out.write(f"Products in the low price range that are likely to remain popular: {counts['Low']} items in the low price range.\n")
+        out.write(f"Mid-priced products with potential for future popularity: {counts['Mid']} items in the mid price range.\n")
+        out.write(f"High-priced products with potential future demand: {counts['High']} items in the high price range.\n")
+        out.write(f"Price distribution decisions: {decision}\n")
+
+
+# Fixed price bands (ETB) for the band notes, as opposed to the quarter-of-range buckets above
+BAND_EDGES = (500, 1500)
+
+
+def price_bands(prices, edges=BAND_EDGES):
+    """Count products below, between and above the fixed band edges (missing prices are left out)."""
+    prices = numeric_prices(prices).dropna()
+    low, high = edges
+    return {"Low": int((prices < low).sum()), "Mid": int(((prices >= low) & (prices < high)).sum()), "High": int((prices >= high).sum())}
+
+
+@span("analysis")
+def write_band_notes(trend_path, decisions_path, data, price="Price"):
+    """Write the two-line trend note on the dominant fixed price band, and the matching decision note."""
+    bands = price_bands(data[price])
+    if bands["High"] > bands["Mid"] and bands["High"] > bands["Low"]:
+        trend = [
+            "High priced items are more popular, indicating a rise in premium product demand.",
+            "ከፍተኛ ዋጋ ያላቸው እቃዎች በጣም ተደጋጋሚ ናቸው፣ ይህም በፕሪሚየም ምርቶች ላይ የፍላጎት መጨመርን ያሳያል.",
+        ]
+    elif bands["Mid"] > bands["High"] and bands["Mid"] > bands["Low"]:
+        trend = [
+            "Mid-priced items are more common, indicating a strong demand in this price range.",
+            "በዚህ የዋጋ ክልል ውስጥ ተወዳጅነት እያደገ መሆኑን የሚያመለክተው የመሃል ክልል ዕቃዎች የበላይነት አላቸው።",
+        ]
+    else:
+        trend = [
+            "Low-priced items are gaining more popularity in the market.",
+            "ዝቅተኛ ዋጋ ያላቸው እቃዎች የበላይ ናቸው፣ ይህም በተመጣጣኝ ዋጋ ለታዋቂነት ቁልፍ ምክንያት መሆኑን ይጠቁማል.",
+        ]
+    if bands["High"]:
+        decisions = [
+            "High-priced items are trending with strong demand in premium categories.",
+            "ከፍተኛ ዋጋ ያላቸው እቃዎች በጣም ተደጋጋሚ ናቸው፣ ይህም በፕሪሚየም ምርቶች ላይ የፍላጎት መጨመርን ያሳያል.",
+        ]
+    else:
+        decisions = [
+            "Consider targeting lower price ranges for a broader market appeal.",
+            "ለአፍላፊ ገበሬ ማስተዋወቅ በዝቅተኛ ዋጋ ተመራጭ የትኛውንም እቃ ማምረት ተመክሮ ይሆናል።",
+        ]
+    with open(trend_path, "w", encoding="utf-8") as out:
+        out.write("\n".join(trend))
+    with open(decisions_path, "w", encoding="utf-8") as out:
+        out.write("\n".join(decisions))
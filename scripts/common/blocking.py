@@ -0,0 +1,122 @@
+import os
+import re
+from collections import Counter
+
+# Resource types that never carry the listing text we scrape
+DEFAULT_BLOCKED_TYPES = ("image", "media", "font")
+
+# Analytics, ad and tracking hosts loaded by the marketplaces we scrape
+DEFAULT_BLOCKED_URLS = (
+    r"google-analytics\.com",
+    r"googletagmanager\.com",
+    r"googlesyndication\.com",
+    r"doubleclick\.net",
+    r"adservice\.google\.",
+    r"connect\.facebook\.net",
+    r"facebook\.com/tr[/?]",
+    r"hotjar\.com",
+    r"clarity\.ms",
+    r"yandex\.ru/metrika",
+    r"mc\.yandex\.",
+)
+
+# Blocked requests never download, so savings are estimated from typical sizes per resource type
+TYPICAL_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 40_000,
+    "stylesheet": 20_000,
+}
+OTHER_BYTES = 5_000
+
+
+class BlockRules:
+    """Deny by resource type or URL pattern; allow patterns always win."""
+
+    def __init__(self, types=DEFAULT_BLOCKED_TYPES, urls=DEFAULT_BLOCKED_URLS, allow=()):
+        self.types = frozenset(types)
+        self.urls = [re.compile(pattern) for pattern in urls]
+        self.allow = [re.compile(pattern) for pattern in allow]
+
+    def extend(self, types=(), urls=(), allow=()):
+        # Site rules build on the defaults rather than repeating them
+        return BlockRules(
+            self.types | set(types),
+            [p.pattern for p in self.urls] + list(urls),
+            [p.pattern for p in self.allow] + list(allow),
+        )
+
+    def blocks(self, resource_type, url):
+        if any(pattern.search(url) for pattern in self.allow):
+            return False
+        return resource_type in self.types or any(pattern.search(url) for pattern in self.urls)
+
+
+DEFAULT_RULES = BlockRules()
+
+# Per-site additions, keyed by job name (see common/jobs.py)
+SITE_RULES = {
+    # Marketplace pages fire logging beacons continuously while scrolling
+    "eph": DEFAULT_RULES.extend(urls=[r"facebook\.com/ajax/bz", r"facebook\.com/.*/logging/"]),
+    "melat": DEFAULT_RULES.extend(urls=[r"facebook\.com/ajax/bz", r"facebook\.com/.*/logging/"]),
+}
+
+
+def blocking_enabled():
+    # On by default; SCRAPE_BLOCK_RESOURCES=0 turns it off when debugging a page
+    return os.environ.get("SCRAPE_BLOCK_RESOURCES", "1") != "0"
+
+
+class RequestBlocker:
+    """page.route layer that aborts requests matching the site's rules and keeps a tally."""
+
+    def __init__(self, site=None, rules=None):
+        self.site = site
+        self.rules = rules or SITE_RULES.get(site, DEFAULT_RULES)
+        self.blocked = Counter()
+        self.allowed = 0
+
+    def _should_block(self, request):
+        if self.rules.blocks(request.resource_type, request.url):
+            self.blocked[request.resource_type] += 1
+            return True
+        self.allowed += 1
+        return False
+
+    def handle(self, route):
+        if self._should_block(route.request):
+            route.abort()
+        else:
+            route.fallback()
+
+    async def handle_async(self, route):
+        if self._should_block(route.request):
+            await route.abort()
+        else:
+            await route.fallback()
+
+    @property
+    def blocked_requests(self):
+        return sum(self.blocked.values())
+
+    @property
+    def estimated_bytes_saved(self):
+        return sum(TYPICAL_BYTES.get(kind, OTHER_BYTES) * count for kind, count in self.blocked.items())
+
+    def summary(self):
+        kinds = ", ".join(f"{kind}={count}" for kind, count in self.blocked.most_common())
+        return (
+            f"[{self.site or 'scrape'}] blocked {self.blocked_requests} of {self.blocked_requests + self.allowed} requests"
+            f" (~{self.estimated_bytes_saved / 1_000_000:.1f} MB saved){': ' + kinds if kinds else ''}"
+        )
+
+    def install(self, context):
+        context.route("**/*", self.handle)
+        context.on("close", lambda _: print(self.summary()))
+        return self
+
+    async def install_async(self, context):
+        await context.route("**/*", self.handle_async)
+        context.on("close", lambda _: print(self.summary()))
+        return self
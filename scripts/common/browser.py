@@ -0,0 +1,203 @@
+import functools
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import asynccontextmanager, contextmanager
+
+from playwright.async_api import async_playwright
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError, sync_playwright
+
+from common.blocking import RequestBlocker, blocking_enabled
+from common.fetch import FIXTURE_ENV, fixture_url
+from common.metrics import current_run
+
+# Flags Playwright itself passes to headless Chromium on CI runners
+CHROMIUM_ARGS = [
+    "--headless=new",
+    "--no-sandbox",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--disable-dev-shm-usage",
+]
+
+
+@contextmanager
+def launch_browser(headless=True):
+    """Launch a private Chromium for a single script run."""
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless)
+        try:
+            yield browser
+        finally:
+            browser.close()
+
+
+@asynccontextmanager
+async def launch_browser_async(headless=True):
+    """Async counterpart of launch_browser for the async_playwright scrapers."""
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        try:
+            yield browser
+        finally:
+            await browser.close()
+
+
+# Page methods timed as run stages
+PAGE_SPANS = {"goto": "navigate", "wait_for_selector": "wait", "wait_for_load_state": "wait"}
+
+
+def _count_response(run, response):
+    # Documents and XHR/fetch carry the listings; headers are already in hand, so no extra round trip
+    if response.request.resource_type in ("document", "xhr", "fetch"):
+        run.count("pages")
+        run.count("bytes", int(response.headers.get("content-length") or 0))
+
+
+def _timed(run, stage, method):
+    @functools.wraps(method)
+    def timed(*args, **kwargs):
+        with run.span(stage):
+            try:
+                return method(*args, **kwargs)
+            except PlaywrightTimeoutError:
+                run.count("timeouts")
+                raise
+    return timed
+
+
+def _timed_async(run, stage, method):
+    @functools.wraps(method)
+    async def timed(*args, **kwargs):
+        with run.span(stage):
+            try:
+                return await method(*args, **kwargs)
+            except PlaywrightTimeoutError:
+                run.count("timeouts")
+                raise
+    return timed
+
+
+def _instrument(context):
+    """Time navigation and waits on every page of context, counting responses, for the current run."""
+    run = current_run()
+    if run is None:
+        return
+    new_page = context.new_page
+
+    @functools.wraps(new_page)
+    def instrumented_new_page(*args, **kwargs):
+        page = new_page(*args, **kwargs)
+        for name, stage in PAGE_SPANS.items():
+            setattr(page, name, _timed(run, stage, getattr(page, name)))
+        page.on("response", lambda response: _count_response(run, response))
+        return page
+
+    context.new_page = instrumented_new_page
+
+
+def _instrument_async(context):
+    run = current_run()
+    if run is None:
+        return
+    new_page = context.new_page
+
+    @functools.wraps(new_page)
+    async def instrumented_new_page(*args, **kwargs):
+        page = await new_page(*args, **kwargs)
+        for name, stage in PAGE_SPANS.items():
+            setattr(page, name, _timed_async(run, stage, getattr(page, name)))
+        page.on("response", lambda response: _count_response(run, response))
+        return page
+
+    context.new_page = instrumented_new_page
+
+
+def _replay_fixture(route):
+    # Benchmark runs: answer every request the page makes from the local fixture server
+    route.fulfill(response=route.fetch(url=fixture_url(route.request.url)))
+
+
+async def _replay_fixture_async(route):
+    await route.fulfill(response=await route.fetch(url=fixture_url(route.request.url)))
+
+
+def new_context(browser, site=None, **options):
+    """Open an isolated context for one scraper, blocking heavy resources unless disabled."""
+    context = browser.new_context(**options)
+    _instrument(context)
+    # Routes run newest first, so the blocker still sees each request before the fixture replay
+    if os.environ.get(FIXTURE_ENV):
+        context.route("**/*", _replay_fixture)
+    if blocking_enabled():
+        RequestBlocker(site).install(context)
+    return context
+
+
+async def new_context_async(browser, site=None, **options):
+    """Async counterpart of new_context."""
+    context = await browser.new_context(**options)
+    _instrument_async(context)
+    if os.environ.get(FIXTURE_ENV):
+        await context.route("**/*", _replay_fixture_async)
+    if blocking_enabled():
+        await RequestBlocker(site).install_async(context)
+    return context
+
+
+@contextmanager
+def shared_chromium(startup_timeout=30):
+    """Start one Chromium process and yield its CDP endpoint for other threads to connect to."""
+    with sync_playwright() as p:
+        executable = p.chromium.executable_path
+
+    user_data_dir = tempfile.mkdtemp(prefix="scrape-chromium-")
+    process = subprocess.Popen(
+        [executable, *CHROMIUM_ARGS, "--remote-debugging-port=0", f"--user-data-dir={user_data_dir}", "about:blank"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        # Chromium writes the port it picked to DevToolsActivePort once it is ready
+        port_file = os.path.join(user_data_dir, "DevToolsActivePort")
+        deadline = time.monotonic() + startup_timeout
+        while not os.path.exists(port_file) or os.path.getsize(port_file) == 0:
+            if process.poll() is not None:
+                raise RuntimeError(f"Chromium exited during startup with code {process.returncode}")
+            if time.monotonic() > deadline:
+                raise RuntimeError("Timed out waiting for Chromium to start")
+            time.sleep(0.05)
+        with open(port_file, encoding="utf-8") as f:
+            port = f.readline().strip()
+        yield f"http://127.0.0.1:{port}"
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+        shutil.rmtree(user_data_dir, ignore_errors=True)
+
+
+@contextmanager
+def connect_browser(endpoint):
+    """Attach this thread to the shared Chromium; closing only drops our contexts."""
+    with sync_playwright() as p:
+        browser = p.chromium.connect_over_cdp(endpoint)
+        try:
+            yield browser
+        finally:
+            browser.close()
+
+
+@asynccontextmanager
+async def connect_browser_async(endpoint):
+    """Async counterpart of connect_browser."""
+    async with async_playwright() as p:
+        browser = await p.chromium.connect_over_cdp(endpoint)
+        try:
+            yield browser
+        finally:
+            await browser.close()
@@ -0,0 +1,106 @@
+import re
+
+from common.metrics import count
+
+# Only script-initiated requests carry listing payloads; documents, images and scripts are never parsed
+CAPTURED_TYPES = ("xhr", "fetch")
+
+
+class JsonFeed:
+    """Where a client-rendered site's listing JSON comes from and how a record maps onto the scraper's fields.
+
+    url_pattern: regex searched in the response URL. fields: {field: dotted path
+    into one record, or fn(record)}. records: dotted path to the list of records
+    in the payload; None finds the first list of objects holding every required key
+    (by default the first path segment of the 'title' and 'link' fields).
+    """
+
+    def __init__(self, url_pattern, fields, records=None, required=None):
+        self.url_pattern = re.compile(url_pattern)
+        self.fields = fields
+        self.records = records
+        if required is None:
+            required = [path.split(".")[0] for name, path in fields.items() if name in ("title", "link") and isinstance(path, str)]
+        self.required = tuple(required)
+
+    def matches(self, url):
+        return self.url_pattern.search(url) is not None
+
+    def rows(self, payload):
+        records = dig(payload, self.records) if self.records else find_records(payload, self.required)
+        rows = []
+        for record in records or ():
+            if isinstance(record, dict):
+                rows.append({
+                    name: path(record) if callable(path) else dig(record, path)
+                    for name, path in self.fields.items()
+                })
+        return rows
+
+
+def dig(value, path):
+    """Follow a dotted path ('price_obj.value', 'items.0.url') through dicts and lists; None when it breaks off."""
+    for part in path.split("."):
+        if isinstance(value, dict):
+            value = value.get(part)
+        elif isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        else:
+            return None
+    return value
+
+
+def find_records(value, required):
+    """The first list of objects (depth first) whose objects all hold the required keys."""
+    if isinstance(value, list):
+        if value and all(isinstance(item, dict) and all(key in item for key in required) for item in value):
+            return value
+        children = value
+    elif isinstance(value, dict):
+        children = value.values()
+    else:
+        return None
+    for child in children:
+        found = find_records(child, required)
+        if found is not None:
+            return found
+    return None
+
+
+class ResponseCapture:
+    """Collect listing rows from a page's JSON responses as scrolling triggers them.
+
+    The response handler only queues matching responses: reading a body from
+    inside a sync Playwright event handler can deadlock, so bodies are parsed
+    in drain(), between scroll steps. urls keeps every payload URL matched, in
+    order, so the last one is where the feed's cursor had got to; headers are
+    the request headers the page sent for the latest one (see replay.record).
+    """
+
+    def __init__(self, page, feed):
+        self.feed = feed
+        self.pending = []
+        self.urls = []
+        self.payloads = 0
+        self.headers = {}
+        page.on("response", self._on_response)
+
+    def _on_response(self, response):
+        if response.request.resource_type in CAPTURED_TYPES and self.feed.matches(response.url):
+            self.pending.append(response)
+
+    def drain(self):
+        """Rows from every payload that arrived since the last call (empty when none matched)."""
+        pending, self.pending = self.pending, []
+        rows = []
+        for response in pending:
+            try:
+                payload = response.json()
+            except Exception:
+                continue  # Not JSON after all (or the page navigated away): the DOM fallback covers it
+            self.payloads += 1
+            self.urls.append(response.url)
+            self.headers = response.request.headers
+            rows.extend(self.feed.rows(payload))
+        count("items", len(rows))
+        return rows
@@ -0,0 +1,84 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from common.metrics import span
+from common.urls import listing_key
+
+NEW = "new"
+EXISTING = "existing"
+CHANGED = "changed"
+REMOVED = "removed"
+STATUSES = (NEW, EXISTING, CHANGED, REMOVED)
+
+# Most scripts write 'New'/'Existing' rather than the lowercase names
+CAPITALISED = {status: status.capitalize() for status in STATUSES}
+
+Diff = namedtuple("Diff", ["merged", "counts"])
+
+# Key columns holding listing URLs; these match on listing_key, so tracking parameters never split a listing
+LINK_COLUMNS = ("link", "Link")
+
+
+def key_values(frame, column):
+    values = frame[column]
+    if column in LINK_COLUMNS:
+        values = values.map(listing_key)
+    return values.astype(str)
+
+
+def key_index(frame, key):
+    """Index of the key column(s) as strings, so values survive a CSV round trip ('2015' == 2015)."""
+    columns = [key] if isinstance(key, str) else list(key)
+    if len(columns) == 1:
+        return pd.Index(key_values(frame, columns[0]))
+    return pd.MultiIndex.from_frame(pd.DataFrame({column: key_values(frame, column) for column in columns}))
+
+
+@span("merge")
+def merge_history(existing, incoming, key, compare=(), status_column="status", labels=None, keep_removed=True):
+    """Fold a fresh scrape into its history and classify every row in one vectorised pass.
+
+    Incoming rows are new (key not in history), existing, or changed (key known but
+    one of the `compare` columns differs); history rows missing from the scrape are
+    removed, and are dropped from the result with keep_removed=False. Incoming rows
+    replace history rows with the same key. Returns Diff(merged, counts), where
+    counts maps each status to a row count; status_column=None leaves rows unlabelled.
+    """
+    columns = [key] if isinstance(key, str) else list(key)
+    incoming = incoming[~key_index(incoming, columns).duplicated(keep="last")]
+    new_keys = key_index(incoming, columns)
+
+    if existing is None or existing.empty:
+        old = incoming.iloc[:0]
+        status = np.full(len(incoming), NEW, dtype=object)
+    else:
+        old = existing.drop(columns=[status_column], errors="ignore") if status_column else existing
+        old = old[~key_index(old, columns).duplicated(keep="last")]
+        old_keys = key_index(old, columns)
+
+        known = new_keys.isin(old_keys)
+        status = np.where(known, EXISTING, NEW).astype(object)
+        if compare:
+            # Line history rows up with incoming rows by key and compare as strings
+            previous = old[list(compare)].astype(str).set_axis(old_keys).reindex(new_keys)
+            current = incoming[list(compare)].astype(str).set_axis(new_keys)
+            status[known & (previous != current).any(axis=1).to_numpy()] = CHANGED
+
+        old = old[~old_keys.isin(new_keys)]
+
+    counts = dict.fromkeys(STATUSES, 0)
+    values, totals = np.unique(status, return_counts=True)
+    counts.update(zip(values.tolist(), totals.tolist()))
+    counts[REMOVED] = len(old)
+
+    if keep_removed:
+        merged = pd.concat([old, incoming], ignore_index=True)
+        status = np.concatenate([np.full(len(old), REMOVED, dtype=object), status])
+    else:
+        merged = incoming.reset_index(drop=True)
+    if status_column:
+        names = {s: (labels or {}).get(s, s) for s in STATUSES}
+        merged[status_column] = pd.Series(status).map(names).to_numpy()
+    return Diff(merged, counts)
@@ -0,0 +1,381 @@
+import os
+from collections import Counter
+from contextlib import contextmanager
+from urllib.parse import urljoin
+
+import pandas as pd
+
+from common.analytics import write_band_notes, write_range_summary, write_recommendations, write_trend_report
+from common.capture import ResponseCapture
+from common.diff import NEW
+from common.extract import extract_all, extract_soup
+from common.fingerprint import Fingerprints, fingerprint, fingerprints_enabled, rows_fingerprint
+from common.known import KnownIndex
+from common.metrics import scrape_run, span
+from common.pagination import prefetch_pages
+from common.plotting import price_chart
+from common.replay import ReplayExpired, load_recipe, record, replay_enabled, replay_pages, save_recipe
+from common.scroll import ScrollSession
+from common.storage import export_csv, history_store
+from common.urls import canonical_url
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+)
+
+# Column that marks a listing New or Existing by whether its `repeats` value was already seen this run
+REPEAT_COLUMN = "Status"
+
+
+class Site:
+    """Everything the engine needs to scrape one site, from the start URL to the files it writes.
+
+    items/fields/defaults use extract_all's spec and pagination is one of the
+    classes below. price parses the raw price text; the 'link' field is
+    canonicalised (relative hrefs resolved against link_base). columns renames
+    fields on output and derived adds {column: fn(record)} after them.
+    history is the key column the scrape is merged into the site's history on
+    (None overwrites the CSV with this run's listings); skip_known drops
+    listings already in the history before the merge. reports run on the saved
+    frame, in order. container is the listing container on static pages as
+    (tag, attrs), what their fingerprint is taken over (common.fingerprint).
+    """
+
+    def __init__(self, name, start_url, folder, output_file, items, fields, pagination, defaults=None,
+                 user_agent=DEFAULT_USER_AGENT, price=None, link_base=None, columns=None, derived=None,
+                 repeats=None, history=None, history_status=None, skip_known=False, reports=(), container=None):
+        self.name = name
+        self.start_url = start_url
+        self.folder = folder
+        self.output_file = output_file
+        self.items = items
+        self.fields = fields
+        self.pagination = pagination
+        self.defaults = defaults
+        self.user_agent = user_agent
+        self.price = price
+        self.link_base = link_base
+        self.columns = columns or {}
+        self.derived = derived or {}
+        self.repeats = repeats
+        self.history = history
+        self.history_status = history_status
+        self.skip_known = skip_known
+        self.reports = reports
+        self.container = container
+
+    @property
+    def output_path(self):
+        return os.path.join(self.folder, self.output_file)
+
+    def column(self, field):
+        return self.columns.get(field, field)
+
+
+@contextmanager
+def browser_for(browser):
+    """The runner's browser, or a private Chromium launched only now that a page has to be driven."""
+    if browser is not None:
+        yield browser
+        return
+    from common.browser import launch_browser
+
+    with launch_browser() as browser:
+        yield browser
+
+
+class NextLink:
+    """Browser pages followed through a "next" link until it disappears (engocha)."""
+
+    def __init__(self, selector, timeout=20000):
+        self.selector = selector
+        self.timeout = timeout
+
+    def batches(self, site, browser, prints=None):
+        from playwright.sync_api import TimeoutError
+        from common.browser import new_context
+
+        with browser_for(browser) as browser, new_context(browser, site.name, user_agent=site.user_agent) as context:
+            page = context.new_page()
+            url = site.start_url
+            while url:
+                print(f"Scraping: {url}")
+                page.goto(url)
+                try:
+                    page.wait_for_selector(site.items, timeout=self.timeout)
+                except TimeoutError:
+                    print(f"Timeout occurred while waiting for listings on {url}.")
+                    return
+
+                # Every listing's fields in one browser round trip
+                rows = extract_all(page, site.items, site.fields, defaults=site.defaults)
+                if not rows:
+                    print(f"No listings found on {url}")
+                    return
+                if prints:
+                    prints.check(url, rows_fingerprint(rows))
+                yield rows
+
+                next_link = page.query_selector(self.selector)
+                href = next_link.get_attribute("href") if next_link else None
+                url = urljoin(page.url, href) if href else None
+                print(f"Moving to the next page: {url}" if url else "No more pages to scrape.")
+
+
+class InfiniteScroll:
+    """One browser page scrolled until the feed stops growing (jiji shops and categories).
+
+    With a capture.JsonFeed, listings are read from the JSON the page fetches as
+    it scrolls; the rendered cards are only extracted when no payload matched.
+    The feed request is then recorded (common.replay) and later runs page
+    through the API over plain HTTP, back in the browser only once the API
+    answers 401/403 or no recipe could be recorded.
+    """
+
+    def __init__(self, timeout=10000, capture=None, replay=True):
+        self.timeout = timeout
+        self.capture = capture
+        self.replay = replay and capture is not None
+
+    def batches(self, site, browser, prints=None):
+        # The feed loads in batches that vary with scroll timing, so the whole of it is fingerprinted at once
+        scraped = []
+        for rows in self.feed(site, browser):
+            if prints:
+                scraped.extend(dict(row) for row in rows)
+            yield rows
+        if prints and scraped:
+            prints.check(site.start_url, rows_fingerprint(scraped))
+
+    def feed(self, site, browser):
+        replayed = set()
+        recipe = load_recipe(site.name) if self.replay and replay_enabled() else None
+        if recipe:
+            print(f"Replaying the listing API recorded at {recipe.recorded_at}: {recipe.url}")
+            try:
+                for rows in replay_pages(recipe, self.capture, defaults=site.defaults):
+                    replayed.update(row["link"] for row in rows)
+                    print(f"Items found so far: {len(replayed)}")
+                    yield rows
+                return
+            except ReplayExpired as e:
+                print(f"The recorded listing API no longer works ({e}); recording it again through the browser.")
+
+        with browser_for(browser) as browser:
+            for rows in self.scroll(site, browser):
+                # Listings the replay already yielded before it was refused are not counted twice
+                yield [row for row in rows if row.get("link") not in replayed] if replayed else rows
+
+    def scroll(self, site, browser):
+        from playwright.sync_api import TimeoutError
+        from common.browser import new_context
+
+        with new_context(browser, site.name, user_agent=site.user_agent) as context:
+            page = context.new_page()
+            # Listening starts before navigation, so payloads fetched while the page first renders count too
+            capture = ResponseCapture(page, self.capture) if self.capture else None
+            page.goto(site.start_url)
+            try:
+                page.wait_for_selector(site.items, timeout=self.timeout)
+            except TimeoutError as e:
+                print(f"Error: Could not load page elements due to timeout. {e}")
+                return
+
+            # Each batch holds only the listings that appeared since the last scroll
+            session = ScrollSession(page, site.items, site.fields, defaults=site.defaults)
+            for rows in session.batches(capture):
+                print(f"Items found so far: {session.seen}")
+                yield rows
+
+            if capture and capture.urls:
+                print(f"Read {capture.payloads} listing payload(s) instead of the DOM; the feed stopped at {capture.urls[-1]}")
+                recipe = record(capture, context.cookies()) if self.replay else None
+                if recipe:
+                    print(f"Next runs replay the listing API over HTTP; recipe saved to '{save_recipe(site.name, recipe)}'.")
+
+
+class PageNumbers:
+    """Numbered static pages fetched with requests, a few ahead of the one being parsed (WooCommerce).
+
+    url is formatted with the page number; the crawl stops at a non-200 page, a
+    page without listings, or one without next_selector.
+    """
+
+    def __init__(self, url, next_selector=None):
+        self.url = url
+        self.next_selector = next_selector
+
+    def batches(self, site, browser=None, prints=None):
+        headers = {"User-Agent": site.user_agent}
+        # Pages matching the last run wait unparsed until one turns out to have changed; when none
+        # has, the engine skips the site and they are never parsed at all
+        deferred = [] if prints else None
+        for page_number, pending in prefetch_pages(self.page_url, headers=headers):
+            print(f"Scraping page {page_number}...")
+            response = pending.result()
+            if response.status_code != 200:
+                print(f"Failed to load page {page_number}. Status code: {response.status_code}")
+                break
+
+            if prints:
+                same = prints.check(self.page_url(page_number), fingerprint(response.text, site.container))
+                if same and deferred is not None:
+                    deferred.append(response.content)
+                    # The same page as last time, so it is the last page if it was then
+                    if prints.had(self.page_url(page_number + 1)):
+                        continue
+                    print("No more pages found. Scraping complete.")
+                    break
+            for content in deferred or ():
+                yield self.parse(site, content)[0]
+            deferred = None
+
+            rows, soup = self.parse(site, response.content)
+            if not rows:
+                print("No more items found. Ending scraping.")
+                return
+            yield rows
+
+            if self.next_selector and soup.select_one(self.next_selector) is None:
+                print("No more pages found. Scraping complete.")
+                return
+
+        # The crawl ended with pages still held back. Unless every page matched the last run (which the
+        # engine skips), they are parsed after all, or their listings would be dropped from the history
+        if deferred and not prints.unchanged:
+            for content in deferred:
+                yield self.parse(site, content)[0]
+
+    def page_url(self, number):
+        return self.url.format(page=number)
+
+    @staticmethod
+    def parse(site, content):
+        from bs4 import BeautifulSoup
+
+        soup = BeautifulSoup(content, "html.parser")
+        return extract_soup(soup, site.items, site.fields, defaults=site.defaults), soup
+
+
+def build_records(site, rows, seen):
+    """Turn raw extracted rows into output records."""
+    records = []
+    for row in rows:
+        if "link" in row:
+            row["link"] = canonical_url(row["link"], base=site.link_base)
+        if site.price and "price" in row:
+            row["price"] = site.price(row["price"])
+        record = {site.column(name): row[name] for name in site.fields}
+        for column, derive in site.derived.items():
+            record[column] = derive(record)
+        if site.repeats:
+            record[REPEAT_COLUMN] = seen.mark(row[site.repeats], new="New", existing="Existing")
+        records.append(record)
+    return records
+
+
+def run_site(site, browser=None):
+    """Scrape one registered site end to end as one recorded run: pages, records, history, reports."""
+    with scrape_run(site.name, site.folder):
+        os.makedirs(site.folder, exist_ok=True)
+
+        store = None
+        if site.history:
+            store = history_store(site.name, site.output_path, site.history, price_column=site.column("price"))
+        prints = None
+        if fingerprints_enabled():
+            # A site with a history is up to date while its store is; the others while their CSV is
+            prints = Fingerprints(site.name, outputs=[] if store is not None else [site.output_path], store=store)
+        seen = KnownIndex(site.repeats) if site.repeats else None
+        records = []
+        for rows in site.pagination.batches(site, browser, prints):
+            records.extend(build_records(site, rows, seen))
+
+        if prints and prints.unchanged:
+            # Same listings as the last run: the merge, reports and charts would come out as they are
+            print(f"Every page matches the last run. {prints.describe()} and the reports are up to date.")
+            return None
+        data = pd.DataFrame(records)
+        if store is not None and site.skip_known and not data.empty:
+            # Listings already in the history are left out, by one lookup of this run's keys
+            data = data[~store.contains(data)].reset_index(drop=True)
+        if data.empty:
+            print(f"No new data found. '{store.location if store is not None else site.output_path}' remains unchanged.")
+            if prints:
+                prints.save()
+            return None
+
+        if store is None:
+            with span("write"):
+                export_csv(data, site.output_path)
+            print(f"Scraping complete. {len(data)} listings saved to '{site.output_path}'.")
+        else:
+            # Fold the new listings into the history, keyed on the site's key column; the reports need all of it back
+            data, counts = store.merge(data, full=bool(site.reports), status_column=site.history_status)
+            print(f"Scraping complete. {counts[NEW]} new items added. Data saved to '{store.location}'.")
+
+        for report in site.reports:
+            report(data, site)
+        if prints:
+            prints.save()
+        return data
+
+
+# Reports: each factory returns a step the engine calls with the saved frame and the site
+
+def chart(file, **options):
+    """Price chart through plotting.price_chart; options pass through (kind, bins, annotate, ...)."""
+    def report(data, site):
+        path = os.path.join(site.folder, file)
+        if price_chart(data, path, price=site.column("price"), title=site.column("title"), **options):
+            print(f"Price distribution plot saved to '{path}'.")
+        else:
+            print(f"Price distribution plot '{path}' is already up to date.")
+    return report
+
+
+def popular_products(file, top=None, priced_only=False):
+    """Titles by how often they are listed (the top ones only, with top), as Title/Frequency."""
+    def report(data, site):
+        titles = data[site.column("title")]
+        if priced_only:
+            titles = titles[data[site.column("price")].notnull()]
+        path = os.path.join(site.folder, file)
+        with span("write"):
+            pd.DataFrame(Counter(titles).most_common(top), columns=["Title", "Frequency"]).to_csv(path, index=False)
+        print(f"Popular products saved to '{path}'.")
+    return report
+
+
+def trend_report(file, sections=None):
+    def report(data, site):
+        path = os.path.join(site.folder, file)
+        write_trend_report(path, data, price=site.column("price"), title=site.column("title"),
+                           link=site.column("link"), sections=sections)
+        print(f"Trend analysis saved to '{path}'.")
+    return report
+
+
+def recommendations(file, sections=None):
+    def report(data, site):
+        path = os.path.join(site.folder, file)
+        write_recommendations(path, data, price=site.column("price"), sections=sections)
+        print(f"Informed decisions saved to '{path}'.")
+    return report
+
+
+def range_summary(file):
+    def report(data, site):
+        path = os.path.join(site.folder, file)
+        write_range_summary(path, data, price=site.column("price"))
+        print(f"Trend analysis saved to '{path}'.")
+    return report
+
+
+def band_notes(trend_file, decisions_file):
+    def report(data, site):
+        trend_path = os.path.join(site.folder, trend_file)
+        decisions_path = os.path.join(site.folder, decisions_file)
+        write_band_notes(trend_path, decisions_path, data, price=site.column("price"))
+        print(f"Trend analysis saved to '{trend_path}', decision-making to '{decisions_path}'.")
+    return report
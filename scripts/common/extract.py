@@ -0,0 +1,88 @@
+from common.metrics import count, span
+
+# Runs inside the page: walks every listing once and reads all fields without
+# a browser round trip per element, returning plain JSON rows. With a mark
+# attribute, listings already stamped are skipped and new ones get stamped.
+EXTRACT_JS = """
+([itemSelector, fields, strip, mark]) => Array.from(document.querySelectorAll(itemSelector)).filter((item) => {
+    if (!mark) return true;
+    if (item.hasAttribute(mark)) return false;
+    item.setAttribute(mark, '');
+    return true;
+}).map((item) => {
+    const row = {};
+    for (const [name, selector, source] of fields) {
+        const el = selector ? item.querySelector(selector) : item;
+        let value = null;
+        if (el) {
+            if (source.startsWith('@')) {
+                value = el.getAttribute(source.slice(1));
+            } else if (source === 'textContent') {
+                value = el.textContent;
+            } else {
+                value = el.innerText;
+            }
+            if (strip && typeof value === 'string') {
+                value = value.trim();
+            }
+        }
+        row[name] = value;
+    }
+    return row;
+})
+"""
+
+
+def compile_fields(fields):
+    """Turn {name: selector | (selector, source)} into the [name, selector, source] list the page script expects."""
+    # source is 'innerText' (default), 'textContent', or '@attribute'; a None selector reads the item itself
+    spec = []
+    for name, field in fields.items():
+        selector, source = (field, "innerText") if isinstance(field, str) or field is None else field
+        spec.append([name, selector, source])
+    return spec
+
+
+def fill_defaults(rows, defaults):
+    # Missing elements come back as None; swap in the script's placeholder text ('N/A', 'No title', ...)
+    if defaults:
+        for row in rows:
+            for name, default in defaults.items():
+                if row.get(name) is None:
+                    row[name] = default
+    return rows
+
+
+def extract_all(page, item_selector, fields, defaults=None, strip=True, mark=None):
+    """Extract every item matching item_selector in a single page.evaluate call."""
+    with span("extract"):
+        rows = page.evaluate(EXTRACT_JS, [item_selector, compile_fields(fields), strip, mark])
+    count("items", len(rows))
+    return fill_defaults(rows, defaults)
+
+
+async def extract_all_async(page, item_selector, fields, defaults=None, strip=True, mark=None):
+    """Async counterpart of extract_all for async_playwright pages."""
+    with span("extract"):
+        rows = await page.evaluate(EXTRACT_JS, [item_selector, compile_fields(fields), strip, mark])
+    count("items", len(rows))
+    return fill_defaults(rows, defaults)
+
+
+def extract_soup(soup, item_selector, fields, defaults=None):
+    """extract_all for pages fetched with requests: the same field spec, read from a BeautifulSoup tree."""
+    with span("extract"):
+        rows = []
+        for item in soup.select(item_selector):
+            row = {}
+            for name, selector, source in compile_fields(fields):
+                el = item.select_one(selector) if selector else item
+                if el is None:
+                    row[name] = None
+                elif source.startswith("@"):
+                    row[name] = el.get(source[1:])
+                else:
+                    row[name] = el.get_text(strip=True)
+            rows.append(row)
+    count("items", len(rows))
+    return fill_defaults(rows, defaults)
@@ -0,0 +1,125 @@
+import os
+import threading
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry, make_headers
+
+from common.httpcache import HttpCache, cache_enabled
+from common.metrics import count, span
+
+# Same desktop Chrome user agent the static scrapers have always sent
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+# (connect, read) seconds; a stalled socket now fails instead of hanging the scrape forever
+DEFAULT_TIMEOUT = (5, 30)
+
+# Connections kept open per host; enough for the concurrent paginators to reuse sockets
+POOL_SIZE = 8
+
+# Retried statuses: rate limiting and transient server/proxy errors
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Set by the offline benchmark (scripts/bench): requests go to its local fixture server instead
+FIXTURE_ENV = "SCRAPE_FIXTURE_URL"
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+
+def _retry_policy():
+    options = dict(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=True,
+        raise_on_status=False,  # hand the last response back so callers can inspect status_code
+    )
+    try:
+        # urllib3 2.x adds random jitter to the exponential backoff
+        return Retry(backoff_jitter=0.5, **options)
+    except TypeError:
+        return Retry(**options)
+
+
+def _new_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE, max_retries=_retry_policy())
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    # accept_encoding=True advertises br as well when a brotli decoder is installed
+    session.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Encoding': make_headers(accept_encoding=True)['accept-encoding'],
+    })
+    return session
+
+
+def get_session(url):
+    """Return the keep-alive session for url's host, creating it on first use."""
+    parts = urlsplit(url)
+    key = (parts.scheme, parts.netloc)
+    with _sessions_lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = _sessions[key] = _new_session()
+        return session
+
+
+def fixture_url(url):
+    """url as /<host>/<path>?<query> on the fixture server when SCRAPE_FIXTURE_URL is set, else unchanged."""
+    base = os.environ.get(FIXTURE_ENV)
+    if not base:
+        return url
+    parts = urlsplit(url)
+    return f"{base.rstrip('/')}/{parts.netloc}{parts.path or '/'}" + (f"?{parts.query}" if parts.query else "")
+
+
+def fetch(url, headers=None, timeout=DEFAULT_TIMEOUT, cache=True, **kwargs):
+    """GET url through the pooled session for its host, with timeouts and retries.
+
+    Pages go through the on-disk HTTP cache (common.httpcache) unless cache=False
+    or SCRAPE_HTTP_CACHE=0: a fresh stored page is returned without a request and
+    a 304 to the conditional request comes back as the stored page, both with
+    response.from_cache set.
+    """
+    url = fixture_url(url)
+    store = HttpCache() if cache and cache_enabled() and "params" not in kwargs else None
+    meta = body = None
+    if store:
+        meta, body = store.load(url)
+        if meta is not None:
+            if store.fresh(meta):
+                count("cache_hits")
+                return store.response(url, meta, body)
+            headers = {**(headers or {}), **store.validators(meta)}
+
+    with span("fetch"):
+        try:
+            response = get_session(url).get(url, headers=headers, timeout=timeout, **kwargs)
+        except requests.Timeout:
+            count("timeouts")
+            raise
+    count("pages")
+    count("bytes", len(response.content))
+    retries = getattr(response.raw, "retries", None)
+    if retries is not None and retries.history:
+        count("retries", len(retries.history))
+
+    if store:
+        if response.status_code == 304 and meta is not None:
+            count("not_modified")
+            store.refresh(url, meta, response)
+            return store.response(url, meta, body)
+        if response.status_code == 200:
+            store.save(url, response)
+    return response
+
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
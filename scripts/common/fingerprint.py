@@ -0,0 +1,164 @@
+import hashlib
+import json
+import os
+import re
+import sys
+import uuid
+
+from common.metrics import count, span
+
+# Digests from each site's last successful run (git-ignored, next to the HTTP cache the workflow keeps)
+FINGERPRINT_DIR_ENV = "SCRAPE_FINGERPRINT_DIR"
+DEFAULT_FINGERPRINT_DIR = ".scrape-cache/fingerprints"
+
+# Markup that changes on every request without the listings changing: scripts, styles,
+# comments, CSP nonces, WordPress/CSRF tokens in forms, meta tags and links
+VOLATILE = [
+    re.compile(r"<script\b.*?</script\s*>", re.S | re.I),
+    re.compile(r"<style\b.*?</style\s*>", re.S | re.I),
+    re.compile(r"<!--.*?-->", re.S),
+    re.compile(r"""\s(?:data-)?nonce=(?:"[^"]*"|'[^']*')""", re.I),
+    re.compile(r"<(?:input|meta)\b[^>]*(?:nonce|csrf|token)[^>]*>", re.I),
+    re.compile(r"(?<=[?&;])_?wpnonce=[0-9a-f]+", re.I),
+]
+WHITESPACE = re.compile(r"\s+")
+
+# The product grid of a WooCommerce shop such as addisber.com, all its pages' fingerprints are taken over
+# (the cart widget and nonces around it change every visit)
+WOOCOMMERCE_CONTAINER = ("ul", {"class": "products"})
+
+
+def fingerprints_enabled():
+    # On by default; SCRAPE_FINGERPRINTS=0 parses and reports every page every run
+    return os.environ.get("SCRAPE_FINGERPRINTS", "1") != "0"
+
+
+def normalise(html):
+    """html without the parts that differ between identical listings pages."""
+    for pattern in VOLATILE:
+        html = pattern.sub("", html)
+    return WHITESPACE.sub(" ", html)
+
+
+def fingerprint(html, container=None):
+    """Content hash of a fetched page, over its listing container only when one is given.
+
+    container is (tag name, attrs) for a bs4 SoupStrainer, e.g. ("ul", {"class": "products"}),
+    so headers, cart counters and sidebars don't count. A page without the container is
+    hashed whole, so a redesign can't look like an unchanged empty listing.
+    """
+    with span("fingerprint"):
+        html = normalise(html)
+        if container:
+            from bs4 import BeautifulSoup, SoupStrainer
+
+            listing = str(BeautifulSoup(html, "html.parser", parse_only=SoupStrainer(*container)))
+            if listing:
+                html = listing
+        return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def rows_fingerprint(rows):
+    """Content hash of extracted rows, whatever order they came in (browser pages, API payloads)."""
+    lines = sorted(json.dumps(row, sort_keys=True, ensure_ascii=False, default=str) for row in rows)
+    return hashlib.sha256("\n".join(lines).encode("utf-8")).hexdigest()
+
+
+def file_digest(path):
+    """Content hash of a file on disk, or None when it is missing."""
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as source:
+            for chunk in iter(lambda: source.read(1 << 20), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class Fingerprints:
+    """One site's page digests, compared with those saved by its last successful run.
+
+    save() records the digests with a hash of each file in outputs and the
+    state() of store (a history store, for sites that merge into one). They
+    only count while those are exactly what that run left (and
+    SCRAPE_FINGERPRINTS isn't 0); otherwise every page is new again. So a run
+    that fails halfway, or whose outputs never got committed (the digests
+    live in the workflow cache, the outputs in git), never makes the next
+    one skip.
+    """
+
+    def __init__(self, site, outputs=(), root=None, store=None):
+        self.path = os.path.join(root or os.environ.get(FINGERPRINT_DIR_ENV, DEFAULT_FINGERPRINT_DIR), f"{site}.json")
+        self.outputs = list(outputs)
+        self.store = store
+        saved = self._load() if fingerprints_enabled() else {}
+        outputs = self.output_digests()
+        keep = None not in outputs.values() and saved.get("outputs") == outputs
+        self.previous = saved.get("pages", {}) if keep else {}
+        self.current = {}
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as source:
+                saved = json.load(source)
+        except (OSError, ValueError):
+            return {}
+        return saved if isinstance(saved, dict) else {}
+
+    def output_digests(self):
+        digests = {path: file_digest(path) for path in self.outputs}
+        if self.store is not None:
+            digests["store"] = self.store.state()
+        return digests
+
+    def describe(self):
+        """The outputs for messages, e.g. "'web-scraping/ecommerce/geez_product.csv'"."""
+        names = self.outputs + ([self.store.location] if self.store is not None else [])
+        return ", ".join(f"'{name}'" for name in names)
+
+    def check(self, key, digest):
+        """Record key's digest for this run; True when it matches the last run's."""
+        self.current[key] = digest
+        same = self.previous.get(key) == digest
+        count("unchanged_pages" if same else "changed_pages")
+        return same
+
+    def had(self, key):
+        """Whether the last run got as far as key (the next page, say)."""
+        return key in self.previous
+
+    @property
+    def unchanged(self):
+        """Every page of this run matches the last run, and the last run had no others."""
+        return bool(self.current) and self.current == self.previous
+
+    def up_to_date(self):
+        """unchanged, said out loud: the outputs would come out as they are, so the caller can stop."""
+        if self.unchanged:
+            print(f"Every page matches the last run; leaving {self.describe()} as it is.")
+        return self.unchanged
+
+    def exit_if_unchanged(self):
+        """End a top-level script when every page matches the last run (functions the runner calls return on up_to_date())."""
+        if self.up_to_date():
+            sys.exit()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        temporary = f"{self.path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary, "w", encoding="utf-8") as out:
+            json.dump({"outputs": self.output_digests(), "pages": self.current}, out, indent=2)
+        os.replace(temporary, self.path)
+
+
+def skip_unchanged_page(site, url, html, outputs=(), container=None, store=None):
+    """Fingerprints of a one-page scraper, after ending the script if the page matches the last run.
+
+    The digest is over container only (see fingerprint()); call save() on the
+    result once the outputs are written.
+    """
+    prints = Fingerprints(site, outputs=outputs, store=store)
+    prints.check(url, fingerprint(html, container))
+    prints.exit_if_unchanged()
+    return prints
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import re
+import time
+import uuid
+
+from requests import Response
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# Where page bodies and their validators are kept between runs (git-ignored; the workflow caches it)
+CACHE_DIR_ENV = "SCRAPE_HTTP_CACHE_DIR"
+DEFAULT_CACHE_DIR = ".scrape-cache/http"
+
+# Pages from servers that send no validators are reused for this long (seconds) before downloading them again
+TTL_ENV = "SCRAPE_HTTP_CACHE_TTL"
+DEFAULT_TTL = 6 * 3600
+
+# Response headers stored with a body: the validators, and what the scripts read back (the charset)
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Cache-Control")
+
+
+def cache_enabled():
+    # On by default; SCRAPE_HTTP_CACHE=0 downloads every page in full
+    return os.environ.get("SCRAPE_HTTP_CACHE", "1") != "0"
+
+
+class HttpCache:
+    """Bodies of 200 responses on disk with their validators, keyed by URL.
+
+    A stored page is served without a request while fresh: for max-age when
+    the server sent one, else for the TTL when it sent neither ETag nor
+    Last-Modified. Otherwise it is revalidated with If-None-Match /
+    If-Modified-Since, so an unchanged page costs a bodiless 304. Responses
+    rebuilt from the store carry from_cache = True.
+    """
+
+    def __init__(self, root=None, ttl=None):
+        self.root = root or os.environ.get(CACHE_DIR_ENV, DEFAULT_CACHE_DIR)
+        self.ttl = float(os.environ.get(TTL_ENV, DEFAULT_TTL)) if ttl is None else ttl
+
+    def _paths(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.root, key[:2], key)
+        return base + ".json", base + ".body"
+
+    def load(self, url):
+        """(meta, body) stored for url, or (None, None)."""
+        meta_path, body_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as source:
+                meta = json.load(source)
+            with open(body_path, "rb") as source:
+                return meta, source.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def fresh(self, meta):
+        headers = CaseInsensitiveDict(meta["headers"])
+        if "max_age" in meta:
+            lifetime = meta["max_age"]
+        elif "ETag" in headers or "Last-Modified" in headers:
+            lifetime = 0
+        else:
+            lifetime = self.ttl
+        return time.time() - meta["stored_at"] < lifetime
+
+    @staticmethod
+    def validators(meta):
+        headers = CaseInsensitiveDict(meta["headers"])
+        conditional = {}
+        if "ETag" in headers:
+            conditional["If-None-Match"] = headers["ETag"]
+        if "Last-Modified" in headers:
+            conditional["If-Modified-Since"] = headers["Last-Modified"]
+        return conditional
+
+    def save(self, url, response):
+        cache_control = response.headers.get("Cache-Control", "").lower()
+        if "no-store" in cache_control:
+            return
+        meta = {
+            "url": url,
+            "stored_at": time.time(),
+            "headers": {name: response.headers[name] for name in KEPT_HEADERS if name in response.headers},
+        }
+        max_age = re.search(r"max-age=(\d+)", cache_control)
+        if max_age:
+            meta["max_age"] = int(max_age.group(1))
+        meta_path, body_path = self._paths(url)
+        os.makedirs(os.path.dirname(meta_path), exist_ok=True)
+        # Body before meta, each replaced atomically: a meta file always points at a complete body
+        _write(body_path, response.content)
+        _write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    def refresh(self, url, meta, response):
+        """Restart the stored page's lifetime after a 304, taking any validators the 304 updated."""
+        meta["stored_at"] = time.time()
+        for name in ("ETag", "Last-Modified"):
+            if name in response.headers:
+                meta["headers"][name] = response.headers[name]
+        meta_path, _ = self._paths(url)
+        _write(meta_path, json.dumps(meta).encode("utf-8"))
+
+    @staticmethod
+    def response(url, meta, body):
+        """A requests.Response for the stored page, as if the server had sent it again."""
+        response = Response()
+        response.status_code = 200
+        response.url = url
+        response.headers = CaseInsensitiveDict(meta["headers"])
+        response.encoding = get_encoding_from_headers(response.headers)
+        response._content = body
+        response._content_consumed = True
+        response.from_cache = True
+        return response
+
+
+def _write(path, data):
+    temporary = f"{path}.{uuid.uuid4().hex}.tmp"
+    with open(temporary, "wb") as out:
+        out.write(data)
+    os.replace(temporary, path)
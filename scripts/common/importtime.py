@@ -0,0 +1,53 @@
+import ast
+import os
+import re
+import subprocess
+import sys
+from collections import namedtuple
+
+SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# "import time:       750 |     529834 | pandas" (self and cumulative microseconds, nesting by indent)
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+# What loading one script costs: total milliseconds and the heaviest top-level imports behind it
+ImportReport = namedtuple("ImportReport", ["module", "total_ms", "top", "error"])
+
+
+def module_imports(module):
+    """The import statements a script runs at module level, in order, without running the script itself."""
+    with open(os.path.join(SCRIPTS_DIR, f"{module}.py"), encoding="utf-8") as source:
+        tree = ast.parse(source.read())
+    return [ast.unparse(node) for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+
+
+def measure(statements):
+    """Run statements in a fresh interpreter under -X importtime; return [(name, self_us, cumulative_us, depth)]."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "\n".join(statements) or "pass"],
+        cwd=SCRIPTS_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode:
+        raise ImportError(proc.stderr.strip().splitlines()[-1])
+    entries = []
+    for line in proc.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            entries.append((name, int(own), int(cumulative), len(indent) // 2))
+    return entries
+
+
+def import_report(module, baseline=frozenset(), top=5):
+    """Cold import cost of a script, not counting modules the bare interpreter already loads (baseline)."""
+    try:
+        entries = [entry for entry in measure(module_imports(module)) if entry[0] not in baseline]
+    except ImportError as e:
+        return ImportReport(module, None, [], str(e))
+    total = sum(own for _, own, _, _ in entries) / 1000
+    heaviest = sorted((entry for entry in entries if entry[3] == 0), key=lambda entry: entry[2], reverse=True)
+    return ImportReport(module, total, [(name, cumulative / 1000) for name, _, cumulative, _ in heaviest[:top]], None)
+
+
+def interpreter_baseline():
+    return frozenset(name for name, _, _, _ in measure([]))
@@ -0,0 +1,50 @@
+from collections import namedtuple
+
+# A registered site: the script module under scripts/ and the function that takes a browser
+# (entry None: a plain requests/BeautifulSoup script that scrapes when run as __main__)
+Job = namedtuple("Job", ["name", "module", "entry"])
+
+PLAYWRIGHT_JOBS = [
+    Job("akia", "akia", "scrape"),
+    Job("arki", "arki", "scrape"),
+    Job("milko", "milko", "scrape"),
+    Job("brandmax", "brandmax", "scrape"),
+    Job("data", "data", "scrape"),
+    Job("plot", "plot", "scrape"),
+    Job("jiji", "jiji", "scrape"),
+    Job("car", "car", "scrape"),
+    Job("ubuy", "ubuy", "scrape_data"),
+    Job("eng", "eng", "scrape"),
+    Job("new", "new", "scrape"),
+    Job("eph", "eph", "scrape"),
+    Job("melat", "melat", "run"),
+]
+
+STATIC_JOBS = [
+    Job(module, module, None)
+    for module in (
+        "Addis_Software", "Addis_ber", "Hellomarketmenshoe", "baby", "coloring", "dagilaptops",
+        "dagilaptopspages", "geez", "hellomarket", "hellomarketpage", "play", "scrape1",
+        "scrape_cosmetics", "scrape_kitchen_cleaning", "scrape_perfumes",
+    )
+]
+
+ALL_JOBS = PLAYWRIGHT_JOBS + STATIC_JOBS
+
+# CI shards the registry by kind, so only the playwright shard downloads Chromium
+KINDS = ("playwright", "static")
+
+
+def job_kind(job):
+    return "playwright" if job.entry else "static"
+
+
+def find_jobs(names=None, registry=PLAYWRIGHT_JOBS):
+    # No names means every job in the registry, in registry order
+    if not names:
+        return list(registry)
+    by_name = {job.name: job for job in registry}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise KeyError(f"Unknown job(s): {', '.join(unknown)}")
+    return [by_name[name] for name in names]
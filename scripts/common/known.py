@@ -0,0 +1,32 @@
+class KnownIndex:
+    """Keys a scraper has already accepted in this run, grown as rows come in.
+
+    A key is one column (e.g. 'title') or several (e.g. ['title', 'year', 'price']);
+    values are compared as strings, as the history stores compare keys.
+    """
+
+    def __init__(self, columns="title", keys=()):
+        self.columns = [columns] if isinstance(columns, str) else list(columns)
+        self.keys = set(keys)
+
+    def key(self, *values):
+        if len(self.columns) == 1:
+            return str(values[0])
+        return tuple(str(v) for v in values)
+
+    def __contains__(self, key):
+        return key in self.keys
+
+    def __len__(self):
+        return len(self.keys)
+
+    def add(self, key):
+        self.keys.add(key)
+
+    def mark(self, *values, new="new", existing="existing"):
+        """Return the new/existing label for a row and remember it, so a repeat later in the run is 'existing'."""
+        key = self.key(*values)
+        if key in self.keys:
+            return existing
+        self.keys.add(key)
+        return new
@@ -0,0 +1,159 @@
+import atexit
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+# Counters every report carries, even when nothing was counted
+COUNTERS = ("pages", "items", "bytes", "retries", "timeouts")
+
+# One JSON object per run is appended here, next to the site's other outputs
+REPORT_FILE = "run_report.jsonl"
+
+
+class RunMetrics:
+    """Stage timings and counters for one scraper run; safe to update from worker threads.
+
+    A stage's total_s adds up every call, so stages run by several fetch threads can exceed duration_s.
+    """
+
+    def __init__(self, site, folder=None):
+        self.site = site
+        self.folder = folder
+        self.started_at = datetime.now(timezone.utc)
+        self.start = time.monotonic()
+        self.stages = {}
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name):
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            self.add_time(name, time.monotonic() - start)
+
+    def add_time(self, name, seconds):
+        with self.lock:
+            calls, total = self.stages.get(name, (0, 0.0))
+            self.stages[name] = (calls + 1, total + seconds)
+
+    def count(self, name, n=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def report(self, status="ok"):
+        with self.lock:
+            return {
+                "site": self.site,
+                "started_at": self.started_at.isoformat(timespec="seconds"),
+                "duration_s": round(time.monotonic() - self.start, 3),
+                "status": status,
+                "stages": {name: {"calls": calls, "total_s": round(total, 3)} for name, (calls, total) in self.stages.items()},
+                "counters": dict(self.counters),
+            }
+
+    def write(self, status="ok"):
+        report = self.report(status)
+        if self.folder is not None:
+            os.makedirs(self.folder, exist_ok=True)
+            with open(os.path.join(self.folder, REPORT_FILE), "a", encoding="utf-8") as f:
+                f.write(json.dumps(report) + "\n")
+        return report
+
+
+_current = ContextVar("scrape_run", default=None)
+
+
+def current_run():
+    """The run being recorded in this thread or task, or None outside of one."""
+    return _current.get()
+
+
+@contextmanager
+def span(name):
+    """Time a stage of the current run; does nothing outside a run. Also usable as a decorator."""
+    run = _current.get()
+    if run is None:
+        yield
+        return
+    with run.span(name):
+        yield
+
+
+def count(name, n=1):
+    run = _current.get()
+    if run is not None:
+        run.count(name, n)
+
+
+def _status(exc):
+    if exc is None:
+        return "ok"
+    if isinstance(exc, SystemExit) and exc.code in (None, 0):
+        return "ok"
+    return f"error: {type(exc).__name__}"
+
+
+@contextmanager
+def scrape_run(site, folder):
+    """Record everything done inside the block as one run of site and append its report to folder."""
+    run = RunMetrics(site, folder)
+    token = _current.set(run)
+    exc = None
+    try:
+        yield run
+    except BaseException as e:
+        exc = e
+        raise
+    finally:
+        _current.reset(token)
+        run.write(_status(exc))
+
+
+def instrumented(site, folder):
+    """Decorator form of scrape_run for a scraper's entry function (sync or async)."""
+    def decorate(func):
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with scrape_run(site, folder):
+                    return await func(*args, **kwargs)
+        else:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with scrape_run(site, folder):
+                    return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _record_crash(kind, value, tb):
+    finish_run(value)
+    sys.__excepthook__(kind, value, tb)
+
+
+def begin_run(site, folder):
+    """Start recording a module-level script; the report is written by finish_run or at interpreter exit."""
+    run = RunMetrics(site, folder)
+    _current.set(run)
+    if sys.excepthook is not _record_crash:
+        sys.excepthook = _record_crash
+        atexit.register(finish_run)
+    return run
+
+
+def finish_run(exc=None):
+    """Write the report of the run begun with begin_run, once; later calls do nothing."""
+    run = _current.get()
+    if run is None:
+        return None
+    _current.set(None)
+    return run.write(_status(exc))
@@ -0,0 +1,24 @@
+import csv
+import os
+
+from common.metrics import span
+
+
+@span("write")
+def write_rows(path, rows, fieldnames=None):
+    """Write scraped dicts to a CSV shaped like DataFrame(rows).to_csv(path, index=False).
+
+    For scrapers that only save what they scraped, so they don't import pandas
+    (half a second of a short cron run) for one write. Columns follow first
+    appearance across the rows unless fieldnames is given.
+    """
+    if fieldnames is None:
+        fieldnames = list(dict.fromkeys(key for row in rows for key in row))
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as out:
+        writer = csv.DictWriter(out, fieldnames=fieldnames, lineterminator="\n")
+        if fieldnames:
+            writer.writeheader()
+        writer.writerows(rows)
@@ -0,0 +1,118 @@
+import contextvars
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import CancelledError, ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+from common.fetch import fetch
+from common.metrics import span
+
+# Politeness defaults: at most this many requests in flight per host, started no faster than RATE per second
+PER_HOST = 4
+RATE = 4.0
+
+# Pages kept in flight ahead of the one being parsed
+PREFETCH_WINDOW = 4
+
+
+class RateLimiter:
+    """Space request starts at least 1/rate seconds apart (thread-safe)."""
+
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self.next_start = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self, cancelled=None):
+        """Block until this request may start; a set cancelled Event cuts the wait short."""
+        with self.lock:
+            now = time.monotonic()
+            start = max(now, self.next_start)
+            self.next_start = start + self.interval
+        if start > now:
+            if cancelled is None:
+                time.sleep(start - now)
+            else:
+                cancelled.wait(start - now)
+
+
+class Paginator:
+    """Fetch known page URLs concurrently with a per-host cap and rate limit."""
+
+    def __init__(self, max_workers=8, per_host=PER_HOST, rate=RATE):
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fetch")
+        self.per_host = per_host
+        self.rate = rate
+        self.lock = threading.Lock()
+        self.slots = {}
+        self.limiters = defaultdict(lambda: RateLimiter(self.rate))
+
+    def _host_gate(self, url):
+        host = urlsplit(url).netloc
+        with self.lock:
+            if host not in self.slots:
+                self.slots[host] = threading.BoundedSemaphore(self.per_host)
+            return self.slots[host], self.limiters[host]
+
+    def _fetch(self, url, kwargs, cancelled):
+        slot, limiter = self._host_gate(url)
+        with slot:
+            # Time spent holding back for politeness, kept apart from the fetch itself
+            with span("throttle"):
+                limiter.wait(cancelled)
+            if cancelled is not None and cancelled.is_set():
+                raise CancelledError(url)
+            return fetch(url, **kwargs)
+
+    def submit(self, url, cancelled=None, **kwargs):
+        """Fetch url on a worker; once the cancelled Event is set it gives up instead of waiting its turn."""
+        # Worker threads count their fetches towards the submitting scraper's run
+        return self.executor.submit(contextvars.copy_context().run, self._fetch, url, kwargs, cancelled)
+
+    def close(self, cancel=False):
+        self.executor.shutdown(wait=not cancel, cancel_futures=cancel)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_paginator():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = Paginator()
+        return _default
+
+
+def prefetch_pages(url_for_page, start=1, stop=None, window=PREFETCH_WINDOW, paginator=None, **kwargs):
+    """Yield (page, future) for start, start+1, ... (up to stop, inclusive) while keeping `window` later pages downloading.
+
+    Crawls usually find their last page by hitting it: break out of the loop on
+    the terminal page and requests not yet sent are dropped, including those
+    already waiting on the host's rate limit. stop caps sites whose page count
+    is known, so nothing past it is ever scheduled.
+    """
+    paginator = paginator or default_paginator()
+    cancelled = threading.Event()
+    in_flight = deque()
+    next_page = start
+    try:
+        while True:
+            while len(in_flight) <= window and (stop is None or next_page <= stop):
+                in_flight.append((next_page, paginator.submit(url_for_page(next_page), cancelled=cancelled, **kwargs)))
+                next_page += 1
+            if not in_flight:
+                return
+            yield in_flight.popleft()
+    finally:
+        cancelled.set()
+        for _, future in in_flight:
+            future.cancel()
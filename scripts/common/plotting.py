@@ -0,0 +1,149 @@
+import hashlib
+import os
+import threading
+
+from common.fingerprint import file_digest
+from common.metrics import span
+
+# pyplot keeps global figure state, so scrapers sharing a process must draw one at a time
+PYPLOT_LOCK = threading.Lock()
+
+# Above this many listings a one-bar-per-title chart is unreadable, so it is aggregated instead
+MAX_ITEMS = 60
+
+# Histogram bins used once a chart is aggregated
+HIST_BINS = 30
+
+# Digests of the data each chart was last drawn from (git-ignored, next to the HTTP cache the workflow keeps)
+STAMP_DIR_ENV = "SCRAPE_CHART_STAMP_DIR"
+DEFAULT_STAMP_DIR = ".scrape-cache/charts"
+
+
+def _agg():
+    # matplotlib costs most of a second to import, so only the stages that draw load it
+    # (numpy, pandas and common.analytics are imported where they're used for the same reason).
+    # Scrapers run headless (CI, worker threads); never let it probe for a GUI toolkit.
+    import matplotlib
+    matplotlib.use("Agg")
+    return matplotlib
+
+
+def pyplot():
+    """matplotlib.pyplot on the Agg backend, for the few charts still drawn through it (hold PYPLOT_LOCK)."""
+    _agg()
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def frame_digest(frame, columns, *params):
+    """Hash of the charted columns plus the chart's own parameters; equal digests draw equal charts."""
+    import pandas as pd
+
+    hashed = pd.util.hash_pandas_object(frame[list(columns)], index=False).to_numpy()
+    digest = hashlib.sha1(hashed.tobytes())
+    digest.update(repr(params).encode())
+    return digest.hexdigest()
+
+
+def _stamp_path(path):
+    # Stamps live in the git-ignored cache the workflow keeps, one per chart path
+    name = hashlib.sha1(os.path.abspath(path).encode("utf-8")).hexdigest()
+    return os.path.join(os.environ.get(STAMP_DIR_ENV, DEFAULT_STAMP_DIR), f"{name}.sha1")
+
+
+def _unchanged(path, digest):
+    """The chart at path was drawn from data with this digest, and is still the file drawn then.
+
+    The stamp outlives a run whose chart never got committed (it's cached, the
+    chart is in git), so it also holds the chart file's own hash.
+    """
+    try:
+        with open(_stamp_path(path), encoding="utf-8") as stamp:
+            return stamp.read() == f"{digest} {file_digest(path)}"
+    except OSError:
+        return False
+
+
+def _stamp(path, digest):
+    stamp_path = _stamp_path(path)
+    os.makedirs(os.path.dirname(stamp_path), exist_ok=True)
+    with open(stamp_path, "w", encoding="utf-8") as stamp:
+        stamp.write(f"{digest} {file_digest(path)}")
+
+
+def _items(ax, prices, titles, annotate):
+    import numpy as np
+
+    positions = np.arange(len(prices))
+    bars = ax.bar(positions, prices, color="skyblue", edgecolor="black")
+    ax.set_xlabel("Items (Scraped Titles)", fontsize=12)
+    ax.set_ylabel("Price (ETB)", fontsize=12)
+    ax.set_xticks(positions)
+    ax.set_xticklabels(titles, rotation=45, ha="right", fontsize=10)
+    if annotate:
+        # Short title over each bar
+        for bar, title in zip(bars, titles):
+            ax.text(bar.get_x() + bar.get_width() / 2, bar.get_height() + 0.5,
+                    title[:10] + "..." if len(title) > 10 else title, ha="center", fontsize=8, rotation=45)
+
+
+def _histogram(ax, prices, bins):
+    import numpy as np
+
+    counts, edges = np.histogram(prices, bins=bins)
+    ax.bar(edges[:-1], counts, width=np.diff(edges), align="edge", color="skyblue", edgecolor="black")
+    ax.set_xlabel("Price Range (ETB)", fontsize=12)
+    ax.set_ylabel("Number of Listings", fontsize=12)
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+
+@span("plot")
+def price_chart(data, path, price="price", title="title", heading="Price Distribution and Range of Items",
+                kind="items", overflow="hist", max_items=MAX_ITEMS, bins=HIST_BINS, annotate=False,
+                figsize=(14, 8), force=False):
+    """Draw the price chart for an in-memory frame and save it to path; return False if it was already current.
+
+    kind="items" draws one bar per listing, labelled with its title, while there
+    are at most max_items of them. Past that it aggregates: overflow="hist" draws a
+    histogram of all prices, overflow="top" keeps the max_items most expensive
+    listings. kind="hist" always draws the histogram.
+
+    The chart is rendered on its own Agg figure rather than through pyplot, so
+    no lock is needed. A digest of the charted data is kept beside the image and
+    an unchanged history is not redrawn unless force is set.
+    """
+    digest = frame_digest(data, (price, title), kind, overflow, max_items, bins, annotate, heading, figsize)
+    if not force and _unchanged(path, digest):
+        return False
+
+    from common.analytics import numeric_prices
+
+    prices = numeric_prices(data[price])
+    valid = prices.notna()
+    prices = prices[valid]
+    titles = data.loc[valid, title].astype(str)
+
+    _agg()
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=figsize)
+    ax = figure.add_subplot()
+    if kind == "items" and len(prices) > max_items:
+        if overflow == "top":
+            keep = prices.nlargest(max_items).index
+            heading = f"{heading} (top {max_items} of {len(prices)} by price)"
+            prices, titles = prices[keep], titles[keep]
+        else:
+            kind = "hist"
+            heading = f"{heading} ({len(prices)} listings)"
+
+    if kind == "items":
+        _items(ax, prices.to_numpy(), titles.tolist(), annotate)
+    else:
+        _histogram(ax, prices.to_numpy(), bins)
+    ax.set_title(heading, fontsize=16)
+
+    figure.tight_layout()
+    figure.savefig(path)
+    _stamp(path, digest)
+    return True
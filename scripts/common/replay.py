@@ -0,0 +1,166 @@
+import json
+import os
+from datetime import datetime, timezone
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from common.extract import fill_defaults
+from common.fetch import fetch
+from common.metrics import count
+
+# Recipes hold session cookies, so they live in a git-ignored folder rather than next to the scraped data
+REPLAY_DIR_ENV = "SCRAPE_REPLAY_DIR"
+DEFAULT_REPLAY_DIR = ".scrape-replay"
+
+# Statuses meaning the API no longer accepts the recorded session
+EXPIRED_STATUSES = (401, 403)
+
+# Request headers not replayed: cookies travel separately, the rest are set per connection
+DROPPED_HEADERS = frozenset({"cookie", "host", "content-length", "connection", "accept-encoding"})
+
+# Hard stop for an API that keeps answering past the end of the feed
+MAX_PAGES = 500
+
+
+def replay_enabled():
+    # On by default; SCRAPE_REPLAY=0 always drives the browser (checking the DOM path, re-recording)
+    return os.environ.get("SCRAPE_REPLAY", "1") != "0"
+
+
+class ReplayExpired(Exception):
+    """The recorded request no longer works (refused, or no listings from its first page); record it again through the browser."""
+
+
+class Recipe:
+    """A listing API request recorded in the browser, replayable page by page over plain HTTP.
+
+    param is the query parameter that pages the feed: it starts at start and
+    advances by step (an offset or a page number, whichever the site uses).
+    """
+
+    def __init__(self, url, param, start, step, headers=None, cookies=None, recorded_at=None):
+        self.url = url
+        self.param = param
+        self.start = start
+        self.step = step
+        self.headers = headers or {}
+        self.cookies = cookies or {}
+        self.recorded_at = recorded_at
+
+    def page_url(self, value):
+        parts = urlsplit(self.url)
+        query = dict(parse_qsl(parts.query, keep_blank_values=True))
+        query[self.param] = str(value)
+        return urlunsplit(parts._replace(query=urlencode(query)))
+
+    def to_dict(self):
+        return dict(vars(self))
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**data)
+
+
+def pagination_param(urls):
+    """(name, first value, step) of the integer query parameter that advances evenly across urls, or None."""
+    queries = [dict(parse_qsl(urlsplit(url).query)) for url in urls]
+    for name in queries[0]:
+        values = [query.get(name, "") for query in queries]
+        if not all(value.isdigit() for value in values):
+            continue
+        numbers = [int(value) for value in values]
+        steps = {after - before for before, after in zip(numbers, numbers[1:])}
+        if len(steps) == 1:
+            step = steps.pop()
+            if step > 0:
+                return name, numbers[0], step
+    return None
+
+
+def record(capture, cookies):
+    """Recipe for the feed capture read from, given the context's cookies; None when its paging can't be told.
+
+    Two payloads are needed to see the step. The replay starts one step before
+    the first captured request, so it also fetches the batch the page rendered
+    server side (offset 0, or page 1).
+    """
+    if len(capture.urls) < 2:
+        return None
+    found = pagination_param(capture.urls)
+    if found is None:
+        return None
+    param, first, step = found
+    host = urlsplit(capture.urls[0]).hostname or ""
+    return Recipe(
+        capture.urls[0], param, max(first - step, 0), step,
+        headers={name: value for name, value in capture.headers.items() if name.lower() not in DROPPED_HEADERS},
+        cookies={
+            cookie["name"]: cookie["value"] for cookie in cookies
+            if host.endswith(cookie.get("domain", "").lstrip("."))
+        },
+        recorded_at=datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    )
+
+
+def recipe_path(site, root=None):
+    return os.path.join(root or os.environ.get(REPLAY_DIR_ENV, DEFAULT_REPLAY_DIR), f"{site}.json")
+
+
+def load_recipe(site):
+    try:
+        with open(recipe_path(site), encoding="utf-8") as source:
+            return Recipe.from_dict(json.load(source))
+    except (OSError, ValueError, TypeError):
+        return None
+
+
+def save_recipe(site, recipe):
+    path = recipe_path(site)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as out:
+        json.dump(recipe.to_dict(), out, indent=2)
+    return path
+
+
+def replay_pages(recipe, feed, defaults=None, max_pages=MAX_PAGES):
+    """Rows of each page of the recorded API, fetched on the pooled client until a page adds nothing.
+
+    Raises ReplayExpired on 401/403, possibly after some pages were yielded,
+    and when the first page fails, isn't JSON or holds no listings: a feed
+    that has moved or changed shape looks like that, not like an empty shop.
+    """
+    seen = set()
+    value = recipe.start
+    for _ in range(max_pages):
+        url = recipe.page_url(value)
+        first = not seen
+        # Never cached: the feed is session-bound and the point is to see its latest listings
+        response = fetch(url, headers=recipe.headers, cookies=recipe.cookies, cache=False)
+        if response.status_code in EXPIRED_STATUSES:
+            count("replay_expired")
+            raise ReplayExpired(f"{response.status_code} from {url}")
+        problem = None
+        if response.status_code != 200:
+            problem = f"status code {response.status_code}"
+        else:
+            try:
+                rows = feed.rows(response.json())
+            except ValueError:
+                problem = "the response is not JSON"
+            else:
+                if not rows:
+                    problem = "no listings in the response"
+        if problem:
+            if first:
+                count("replay_expired")
+                raise ReplayExpired(f"{problem} from {url}")
+            print(f"Replay stopped at {url}: {problem}")
+            return
+
+        # An API that ignores the parameter past the end keeps sending the same page
+        keys = {(row.get("link"), row.get("title")) for row in rows}
+        if not keys - seen:
+            return
+        seen |= keys
+        count("items", len(rows))
+        yield fill_defaults(rows, defaults)
+        value += recipe.step
@@ -0,0 +1,52 @@
+import asyncio
+import importlib
+import inspect
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from common.browser import connect_browser, connect_browser_async, shared_chromium
+
+
+def load_entry(job):
+    module = importlib.import_module(job.module)
+    return getattr(module, job.entry)
+
+
+async def _run_async(entry, endpoint):
+    async with connect_browser_async(endpoint) as browser:
+        await entry(browser)
+
+
+def run_job(entry, endpoint):
+    # Each worker thread gets its own Playwright driver attached to the shared Chromium
+    start = time.monotonic()
+    if inspect.iscoroutinefunction(entry):
+        asyncio.run(_run_async(entry, endpoint))
+    else:
+        with connect_browser(endpoint) as browser:
+            entry(browser)
+    return time.monotonic() - start
+
+
+def run_jobs(jobs, max_workers=4):
+    """Run jobs on one Chromium with at most max_workers at a time; return the names that failed."""
+    # Import every script up front so pandas/matplotlib load once and import errors surface early
+    entries = {job.name: load_entry(job) for job in jobs}
+    failed = []
+
+    start = time.monotonic()
+    with shared_chromium() as endpoint:
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scrape") as pool:
+            futures = {pool.submit(run_job, entries[job.name], endpoint): job for job in jobs}
+            for future in as_completed(futures):
+                job = futures[future]
+                try:
+                    elapsed = future.result()
+                    print(f"[{job.name}] finished in {elapsed:.1f}s")
+                except Exception:
+                    failed.append(job.name)
+                    print(f"[{job.name}] failed:\n{traceback.format_exc()}")
+
+    print(f"Ran {len(jobs)} job(s) in {time.monotonic() - start:.1f}s, {len(failed)} failed.")
+    return failed
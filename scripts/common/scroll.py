@@ -0,0 +1,166 @@
+import time
+
+from common.extract import extract_all, fill_defaults
+from common.metrics import span
+
+# Runs inside the page: scroll to the bottom, then resolve as soon as a
+# MutationObserver sees the listing count grow, or after `timeout` ms
+SCROLL_AND_WAIT_JS = """
+([selector, previous, timeout]) => new Promise((resolve) => {
+    const count = () => document.querySelectorAll(selector).length;
+    window.scrollTo(0, document.scrollingElement.scrollHeight);
+    if (count() > previous) {
+        resolve(count());
+        return;
+    }
+    let timer = null;
+    const observer = new MutationObserver(() => {
+        const current = count();
+        if (current > previous) {
+            clearTimeout(timer);
+            observer.disconnect();
+            resolve(current);
+        }
+    });
+    observer.observe(document.body, {childList: true, subtree: true});
+    timer = setTimeout(() => {
+        observer.disconnect();
+        resolve(count());
+    }, timeout);
+})
+"""
+
+COUNT_JS = "(selector) => document.querySelectorAll(selector).length"
+
+# Stamps every listing not yet stamped, without reading any fields; returns how many it stamped
+MARK_JS = """
+([selector, mark]) => {
+    let stamped = 0;
+    for (const item of document.querySelectorAll(selector)) {
+        if (!item.hasAttribute(mark)) {
+            item.setAttribute(mark, '');
+            stamped++;
+        }
+    }
+    return stamped;
+}
+"""
+
+
+class ScrollTimer:
+    """Adaptive wait budget: a few times the observed load latency, doubled on each stall."""
+
+    def __init__(self, min_timeout=1000, max_timeout=8000, stall_limit=2):
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.stall_limit = stall_limit
+        self.timeout = min_timeout
+        self.stalls = 0
+
+    def loaded(self, elapsed_ms):
+        # New items arrived: budget roughly 3x what the last batch took
+        self.stalls = 0
+        self.timeout = int(min(self.max_timeout, max(self.min_timeout, elapsed_ms * 3)))
+
+    def stalled(self):
+        # Nothing new in time: retry with a longer wait before deciding we've hit the end
+        self.stalls += 1
+        self.timeout = min(self.max_timeout, self.timeout * 2)
+        return self.stalls > self.stall_limit
+
+
+def scroll_steps(page, item_selector, max_scrolls=None, min_timeout=1000, max_timeout=8000, stall_limit=2):
+    """Yield the listing count now and after every scroll that loads more items; stop when the feed stalls."""
+    timer = ScrollTimer(min_timeout, max_timeout, stall_limit)
+    count = page.evaluate(COUNT_JS, item_selector)
+    yield count
+
+    scrolls = 0
+    while max_scrolls is None or scrolls < max_scrolls:
+        scrolls += 1
+        start = time.monotonic()
+        with span("scroll"):
+            current = page.evaluate(SCROLL_AND_WAIT_JS, [item_selector, count, timer.timeout])
+        if current > count:
+            timer.loaded((time.monotonic() - start) * 1000)
+            count = current
+            yield count
+        elif timer.stalled():
+            break
+
+
+def scroll_to_end(page, item_selector, **kwargs):
+    """Scroll until no more items load and return the final listing count."""
+    count = 0
+    for count in scroll_steps(page, item_selector, **kwargs):
+        pass
+    return count
+
+
+class ScrollSession:
+    """Scroll an infinite feed and hand back only the listings that appeared since the last batch."""
+
+    # Listings are stamped with this attribute in the DOM once extracted, so
+    # each node is read exactly once no matter how often we scroll
+    MARK = "data-scraped"
+
+    def __init__(self, page, item_selector, fields, defaults=None, strip=True, **scroll_options):
+        self.page = page
+        self.item_selector = item_selector
+        self.fields = fields
+        self.defaults = defaults
+        self.strip = strip
+        self.scroll_options = scroll_options
+        self.seen = 0
+
+    def extract_new(self):
+        rows = extract_all(self.page, self.item_selector, self.fields, self.defaults, self.strip, mark=self.MARK)
+        self.seen += len(rows)
+        return rows
+
+    def skip_loaded(self):
+        # Their data already came from the feed's JSON: stamp the rendered copies so the DOM is never read for them
+        self.seen += self.page.evaluate(MARK_JS, [self.item_selector, self.MARK])
+
+    def batches(self, capture=None):
+        """Yield a list of freshly loaded listings after every scroll that grows the feed.
+
+        With a ResponseCapture, a batch is the rows parsed from the JSON payloads
+        that arrived during the scroll; the DOM is only read when none matched.
+        """
+        for _ in scroll_steps(self.page, self.item_selector, **self.scroll_options):
+            rows = fill_defaults(capture.drain(), self.defaults) if capture else None
+            if rows:
+                self.skip_loaded()
+            else:
+                rows = self.extract_new()
+            if rows:
+                yield rows
+
+
+async def scroll_steps_async(page, item_selector, max_scrolls=None, min_timeout=1000, max_timeout=8000, stall_limit=2):
+    """Async counterpart of scroll_steps for async_playwright pages."""
+    timer = ScrollTimer(min_timeout, max_timeout, stall_limit)
+    count = await page.evaluate(COUNT_JS, item_selector)
+    yield count
+
+    scrolls = 0
+    while max_scrolls is None or scrolls < max_scrolls:
+        scrolls += 1
+        start = time.monotonic()
+        with span("scroll"):
+            current = await page.evaluate(SCROLL_AND_WAIT_JS, [item_selector, count, timer.timeout])
+        if current > count:
+            timer.loaded((time.monotonic() - start) * 1000)
+            count = current
+            yield count
+        elif timer.stalled():
+            break
+
+
+async def scroll_to_end_async(page, item_selector, **kwargs):
+    """Async counterpart of scroll_to_end."""
+    count = 0
+    async for count in scroll_steps_async(page, item_selector, **kwargs):
+        pass
+    return count
@@ -0,0 +1,248 @@
+import re
+
+from common.capture import JsonFeed
+from common.fingerprint import WOOCOMMERCE_CONTAINER
+from common.engine import (
+    InfiniteScroll, NextLink, PageNumbers, Site, band_notes, chart, popular_products, range_summary,
+    recommendations, trend_report,
+)
+
+# One entry per site the shared engine scrapes; the scripts of the same name only hand it to run_site
+
+JIJI_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36"
+)
+
+
+def engocha_price(text):
+    """'ETB 3,600' -> 3600.0; 'N/A' or anything unparseable -> None."""
+    try:
+        return float(text.replace("ETB", "").replace(",", "").strip()) if text != "N/A" else None
+    except ValueError:
+        return None
+
+
+def jiji_price(text):
+    """Digits only ('ETB 12,500' -> 12500); no digits -> 0. Prices captured from the API are numbers already."""
+    if isinstance(text, (int, float)):
+        return int(text)
+    digits = re.sub(r"[^\d]", "", text)
+    return int(digits) if digits else 0
+
+
+def brand_from_title(title):
+    """The first word of the title as the brand."""
+    return title.split()[0] if title else "Unknown"
+
+
+# Engocha business pages: a listing grid with a "Next »" link to the following page
+ENGOCHA_ITEMS = "div.col-md-12.listingcolumn.normal.fourcolumn"
+ENGOCHA_FIELDS = {
+    "title": "span.listingtitle",
+    "price": "span.price",
+    "description": "div.row.smalldesc",
+    "condition": "div.attrib.cond.new",
+    "location": "span.location",
+    "link": ("a", "@href"),
+}
+ENGOCHA_DEFAULTS = {name: "N/A" for name in ENGOCHA_FIELDS}
+ENGOCHA_COLUMNS = {name: name.capitalize() for name in ENGOCHA_FIELDS}
+ENGOCHA_NEXT = NextLink('a:has-text("Next »")')
+
+
+def engocha(name, start_url, folder, output_file, **options):
+    options.setdefault("fields", ENGOCHA_FIELDS)
+    return Site(
+        name, start_url, folder, output_file, ENGOCHA_ITEMS, pagination=ENGOCHA_NEXT,
+        defaults=ENGOCHA_DEFAULTS, price=engocha_price, columns=ENGOCHA_COLUMNS, **options,
+    )
+
+
+# Jiji shops and categories: an infinite masonry feed, merged into the history on the advert link
+JIJI_ITEMS = "div.masonry-item"
+JIJI_FIELDS = {
+    "title": "div.b-advert-title-inner",
+    "price": "div.qa-advert-price",
+    "description": "div.b-list-advert-base__description-text",
+    "location": "span.b-list-advert__region__text",
+    "link": ("a", "@href"),
+}
+JIJI_DEFAULTS = {
+    "title": "No title",
+    "price": "No price",
+    "description": "No description",
+    "location": "No location",
+    "link": "No link",
+}
+
+
+def jiji_feed(price="price_obj.value"):
+    """The listing API behind the feed: adverts carry the exact price, the region and the advert URL."""
+    return JsonFeed(r"jiji\.com\.et/api_web/v1/", {
+        "title": "title",
+        "price": price,
+        "description": "short_description",
+        "location": "region_name",
+        "link": "url",
+    })
+
+
+def jiji(name, start_url, folder, output_file, feed=None, **options):
+    options.setdefault("price", jiji_price)
+    return Site(
+        name, start_url, folder, output_file, JIJI_ITEMS, JIJI_FIELDS, InfiniteScroll(capture=feed or jiji_feed()),
+        defaults=JIJI_DEFAULTS, user_agent=JIJI_USER_AGENT, link_base="https://jiji.com.et", history="link",
+        skip_known=True, **options,
+    )
+
+
+# addisber.com's WooCommerce category search, paged by number and merged into the history on the product link
+ADDISBER_SEARCH = "https://addisber.com/page/{page}/?s&post_type=product&product_cat=%s"
+WOOCOMMERCE_FIELDS = {
+    "title": "h3.woocommerce-loop-product__title",
+    "price": "span.price",
+    "link": ("a", "@href"),
+}
+WOOCOMMERCE_DEFAULTS = {"title": "No title", "price": "No price", "link": "No link"}
+
+
+def addisber(name, category, folder, output_file, **options):
+    url = ADDISBER_SEARCH % category
+    return Site(
+        name, url.format(page=1), folder, output_file, "div.product-inner", WOOCOMMERCE_FIELDS,
+        PageNumbers(url, next_selector="a.page-numbers:not(.current)[href]"), defaults=WOOCOMMERCE_DEFAULTS,
+        history="link", history_status="status", container=WOOCOMMERCE_CONTAINER, **options,
+    )
+
+
+# The milko and brandmax shops' wording for the report sections that differ from the shared text
+JIJI_TREND_OVERRIDES = {
+    "Mid": (
+        "2. Mid Price Bar (Affordable Quality Products)\n"
+        "English:\n"
+        "- Trend: Consumers are seeking good value for their money, especially during economic uncertainty. Discounts and promotions drive purchases.\n"
+        "- Action: Highlight value-for-money and use seasonal sales and bundle offers to stay competitive.\n"
+        "Amharic:\n"
+        "ተጠቃሚዎች ለገንዘባቸው ጥሩ ዋጋ ይፈልጋሉ ፣ በተለይም በኢኮኖሚያዊ አለመረጋጋት ወቅት። ቅናሾች እና ማስተዋወቂያዎች ግዥዎችን ያቅርቡ.\n"
+        "Action:\n"
+        "በዋጋ-ለገንዘብ ላይ ያተኩሩ እና ወቅታዊ ሽያጮችን ይጠቀሙ እና ተወዳዳሪ ሆነው ለመቆየት የጥቅል አቅርቦቶችን ይጠቀሙ።\n"
+        "\n"
+    ),
+    "Low": (
+        "3. Low Price Bar (Budget Products)\n"
+        "English:\n"
+        "- Trend: Budget-conscious consumers are looking for affordable and quick deals. Flash sales and time-limited offers dominate buying behavior.\n"
+        "- Action: Focus on frequent flash sales and loyalty programs to create urgency and retain customers.\n"
+        "Amharic:\n"
+        "የበጀት ግንዛቤ ያላቸው ተጠቃሚዋች ተመጣጣኝ እና ፈጣን ስምምነቶችን ይፈልጋሉ። የፍላሽ ሽያጭ እና በጊዜ የተገደቡ ቅናሾች ላይ ያተኩሩ .\n"
+        "Action:\n"
+        "አስቸኳይ ሁኔታ ለመፍጠር እና ደንበኞችን ለማቆየት በ ተደጋጋሚ የፍላሽ ሽያጭ እና የታማኝነት ፕሮግራሞች ላይ ያተኩሩ\n"
+    ),
+}
+JIJI_RECOMMENDATION_OVERRIDES = {
+    "Low": (
+        "3. Low Price Bar (Budget Products)\n"
+        "English:\n"
+        "- Attract Customers:\n"
+        "  - Run flash sales (limited-time discounts) to create urgency and encourage quick purchases.\n"
+        "  - Use time-limited offers to make customers feel they’re getting a great deal that won’t last.\n"
+        "- Stay Competitive:\n"
+        "  - Reduce costs by negotiating with suppliers for lower prices or using more efficient methods.\n"
+        "  - Reward repeat customers with loyalty programs (e.g., discounts on next purchase).\n"
+        "Amharic:\n"
+        "ደንበኞችን ይሳቡ:\n"
+        "- አስቸኳይ ሁኔታን ለመፍጠር እና ፈጣን ግዢዎችን ለማበረታታት የፍላሽ ሽያጮችን ያሂዱ  (የተገደበ ጊዜ ቅናሾች)።\n"
+        "- ደንበኞች የማይዘልቅ ትልቅ ነገር እያገኙ እንደሆነ እንዲሰማቸው ለማድረግ ጊዜ-የተገደበ ቅናሾችን ይጠቀሙ.\n"
+        "- ተወዳዳሪ ሁን:\n"
+        "  - ወጪን ይቀንሱ ከአቅራቢዎች ጋር በዝቅተኛ ዋጋ በመደራደር ወይም ይበልጥ ቀልጣፋ ዘዴዎችን በመጠቀም.\n"
+        "  - ተደጋጋሚ ደንበኞችን በ የታማኝነት ፕሮግራሞች ይሸልሙ (ለምሳሌ ፣ በሚቀጥለው ግዢ ላይ ቅናሾች)።\n"
+    ),
+}
+
+
+SITES = {
+    site.name: site
+    for site in (
+        engocha(
+            "akia", "https://engocha.com/business/35538-akia-store?page=1", "eco/akia", "akia.csv", repeats="title",
+            reports=(
+                trend_report("trend_analysis.txt"),
+                recommendations("informed_decision.txt"),
+                chart("akia.jpeg"),
+                popular_products("popular_products.csv", priced_only=True),
+            ),
+        ),
+        engocha(
+            "arki", "https://engocha.com/business/35538-akia-store?page=1", "web-scraping/eco/arki_store",
+            "arki_store.csv", repeats="title",
+            reports=(
+                trend_report("trend_analysis.txt"),
+                recommendations("informed_decision.txt"),
+                chart("arki_store.jpeg"),
+                popular_products("popular_products.csv", priced_only=True),
+            ),
+        ),
+        engocha(
+            "new", "https://engocha.com/business/35538-akia-store?page=1", "web-scraping/ecommerce/project",
+            "engoyes2.csv", repeats="title",
+            reports=(
+                chart("arki2.jpeg"),
+                popular_products("popular_products.csv", priced_only=True),
+                band_notes("trend_analysis.txt", "decision_making.txt"),
+            ),
+        ),
+        engocha(
+            "eng", "https://engocha.com/business/30783-barkot?page=1", "web-scraping/ecommerce", "engoyes.csv",
+            fields={name: field for name, field in ENGOCHA_FIELDS.items() if name != "link"},
+            reports=(chart("price_distribution_with_titles.jpeg", annotate=True),),
+        ),
+        jiji(
+            "milko", "https://jiji.com.et/sellerpage-jYM8FFmFIUMVwKBqpAr8SPa6", "eco/milko", "milko.csv",
+            reports=(
+                chart("milko.jpeg"),
+                popular_products("popular_products.csv", top=10),
+                trend_report("trend_analysis.txt", sections=JIJI_TREND_OVERRIDES),
+                recommendations("informed_decisions.txt", sections=JIJI_RECOMMENDATION_OVERRIDES),
+            ),
+        ),
+        jiji(
+            "brandmax", "https://jiji.com.et/shop/brandmax/shoes", "eco/brandmax", "brandmax.csv",
+            reports=(
+                chart("brandmax.jpeg"),
+                popular_products("popular_products.csv", top=10),
+                trend_report("trend_analysis.txt", sections=JIJI_TREND_OVERRIDES),
+                recommendations("informed_decisions.txt", sections=JIJI_RECOMMENDATION_OVERRIDES),
+            ),
+        ),
+        jiji(
+            "data", "https://jiji.com.et/sellerpage-jYM8FFmFIUMVwKBqpAr8SPa6", "web-scraping/ecommerce/project",
+            "brand22.csv",
+            # Its own report files: the "new" site writes the same folder, and the runner may run both at once
+            reports=(
+                chart("brand22.jpeg"),
+                popular_products("brand22_popular_products.csv", top=10),
+                range_summary("brand22_trend_analysis.txt"),
+            ),
+        ),
+        jiji(
+            "plot", "https://jiji.com.et/sellerpage-jYM8FFmFIUMVwKBqpAr8SPa6", "web-scraping/ecommerce", "brand22.csv",
+            derived={"brand": lambda record: brand_from_title(record["title"])},
+            reports=(
+                chart("plot.jpeg", kind="hist", bins=10, heading="Price Distribution of Scraped Items", figsize=(12, 8)),
+            ),
+        ),
+        # Sofa listings keep their price text as shown
+        jiji(
+            "jiji", "https://jiji.com.et/addis-ababa/furniture?filter_attr_248_type=Sofas", "web-scraping/ecommerce",
+            "furniture.csv", price=None, feed=jiji_feed(price="price_obj.view"),
+        ),
+        addisber(
+            "Addis_ber", "coloring-and-activity-book-educational-entertainment-items", "web-scraping/ecommerce",
+            "coloring and activity book.csv",
+        ),
+        addisber(
+            "coloring", "coloring-and-activity-book-educational-entertainment-items", "web-scraping/ecommerce",
+            "coloring_and_activity_book.csv",
+        ),
+    )
+}
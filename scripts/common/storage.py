@@ -0,0 +1,489 @@
+import glob
+import json
+import os
+import re
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+
+import pandas as pd
+
+from common.diff import EXISTING, NEW, REMOVED, STATUSES, Diff, key_index, merge_history
+from common.fingerprint import file_digest
+from common.metrics import span
+
+# Which backend keeps scrape history: 'csv' (default, the files committed by the workflows), 'parquet' or 'sqlite'
+STORAGE_ENV = "SCRAPE_STORAGE"
+PARQUET_ROOT_ENV = "SCRAPE_PARQUET_ROOT"
+DEFAULT_PARQUET_ROOT = "web-scraping/parquet"
+
+# With the parquet backend, also refresh the CSV next to it unless SCRAPE_CSV_EXPORT=0;
+# the sqlite backend only rewrites it with SCRAPE_CSV_EXPORT=1
+CSV_EXPORT_ENV = "SCRAPE_CSV_EXPORT"
+
+
+class HistoryStore:
+    """What the scripts call on every backend: the new-item check and the merge, over load() and save().
+
+    Backends that can answer from an index override contains() and merge()
+    rather than loading the whole history. Each also has location (where
+    save() writes, for messages) and state(), a token that changes whenever
+    the stored history does and is None while nothing is stored.
+    """
+
+    _history = None
+
+    def history(self):
+        """load(), read once per store and reused until the next merge."""
+        if self._history is None:
+            self._history = self.load()
+        return self._history
+
+    def contains(self, frame):
+        """Boolean Series over frame's rows: whose key is already in the history."""
+        existing = self.history()
+        if existing.empty:
+            return pd.Series(False, index=frame.index)
+        return pd.Series(key_index(frame, self.key).isin(key_index(existing, self.key)), index=frame.index)
+
+    def merge(self, incoming, full=True, **options):
+        """Fold incoming into the history with merge_history(**options), save both, and return the Diff.
+
+        full asks for the whole history in Diff.merged (for reports); backends
+        that load it anyway always return it.
+        """
+        diff = merge_history(self.history(), incoming, self.key, **options)
+        self.save(diff.merged, incoming)
+        self._history = None
+        return diff
+
+
+class CsvStore(HistoryStore):
+    """The original layout: one CSV per site, re-read and rewritten in full every run."""
+
+    def __init__(self, site, csv_path, key):
+        self.site = site
+        self.csv_path = csv_path
+        self.key = key
+
+    @property
+    def location(self):
+        return self.csv_path
+
+    def state(self):
+        return file_digest(self.csv_path)
+
+    @span("load")
+    def load(self):
+        return pd.read_csv(self.csv_path) if os.path.exists(self.csv_path) else pd.DataFrame()
+
+    @span("write")
+    def save(self, merged, incoming=None):
+        export_csv(merged, self.csv_path)
+
+
+class ParquetStore(HistoryStore):
+    """Append-only Parquet history partitioned as <root>/site=<site>/date=<YYYY-MM-DD>/part-*.parquet.
+
+    Each run writes one new file holding only the rows it scraped; nothing is
+    rewritten. Reads push column selection and date filters down to pyarrow so
+    only matching partitions and columns are decoded. Beside the partitions,
+    latest.parquet keeps the latest row per key: load() reads only that, so a
+    run's cost follows the number of listings rather than the number of runs.
+    """
+
+    def __init__(self, site, csv_path, key, root=None, export=None):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise ImportError("The parquet storage backend needs pyarrow: pip install pyarrow") from e
+        self.site = site
+        self.csv_path = csv_path
+        self.key = [key] if isinstance(key, str) else list(key)
+        self.root = root or os.environ.get(PARQUET_ROOT_ENV, DEFAULT_PARQUET_ROOT)
+        self.export = os.environ.get(CSV_EXPORT_ENV, "1") != "0" if export is None else export
+
+    @property
+    def site_dir(self):
+        return os.path.join(self.root, f"site={self.site}")
+
+    @property
+    def latest_path(self):
+        return os.path.join(self.site_dir, "latest.parquet")
+
+    @property
+    def location(self):
+        return self.csv_path if self.export else self.site_dir
+
+    def state(self):
+        return file_digest(self.latest_path)
+
+    def append(self, frame, date=None):
+        """Write frame as a new part file under today's (or the given) date partition."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if frame.empty:
+            return None
+        now = datetime.now(timezone.utc)
+        date = date or now.strftime("%Y-%m-%d")
+        partition = os.path.join(self.site_dir, f"date={date}")
+        os.makedirs(partition, exist_ok=True)
+        # Part names sort by write time, so reading in path order replays history in order
+        path = os.path.join(partition, f"part-{now:%Y%m%dT%H%M%S%f}-{uuid.uuid4().hex[:8]}.parquet")
+        # Scraped fields are text; storing them as strings keeps the schema identical across runs
+        table = pa.Table.from_pandas(frame.astype("string"), preserve_index=False)
+        pq.write_table(table, path)
+        return path
+
+    def read(self, columns=None, filters=None):
+        """Read observations, e.g. filters=[('date', '>=', '2024-01-01')]; the date column is the partition."""
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        # Part files sorted by path (date, then write time), so later runs come last
+        files = sorted(glob.glob(os.path.join(self.site_dir, "date=*", "*.parquet")))
+        if not files:
+            return pd.DataFrame(columns=columns)
+        # Columns can be added between runs; unify the footers so older files just read as null
+        date = pa.schema([("date", pa.string())])
+        schema = pa.unify_schemas([pq.read_schema(path) for path in files] + [date])
+        dataset = ds.dataset(
+            files,
+            schema=schema,
+            format="parquet",
+            partitioning=ds.partitioning(date, flavor="hive"),
+            partition_base_dir=self.site_dir,
+        )
+        expression = None
+        for column, op, value in filters or ():
+            term = _compare(ds.field(column), op, value)
+            expression = term if expression is None else expression & term
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+    def import_csv(self):
+        """Seed an empty dataset from the site's existing CSV so switching backends keeps the history."""
+        if os.path.exists(self.csv_path):
+            modified = datetime.fromtimestamp(os.path.getmtime(self.csv_path), timezone.utc)
+            self.append(pd.read_csv(self.csv_path), date=modified.strftime("%Y-%m-%d"))
+
+    def latest(self, frame):
+        return frame[~key_index(frame, self.key).duplicated(keep="last")].reset_index(drop=True)
+
+    def write_latest(self, frame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        os.makedirs(self.site_dir, exist_ok=True)
+        temporary = f"{self.latest_path}.{uuid.uuid4().hex}.tmp"
+        pq.write_table(pa.Table.from_pandas(frame.astype("string"), preserve_index=False), temporary)
+        os.replace(temporary, self.latest_path)
+
+    @span("load")
+    def load(self):
+        """Latest observation per key, in the shape (and column types) the scripts used to get from read_csv."""
+        import pyarrow.parquet as pq
+
+        if os.path.exists(self.latest_path):
+            return _typed(pq.read_table(self.latest_path).to_pandas())
+        # Histories written before latest.parquet existed: replay them once and keep the result
+        if not glob.glob(os.path.join(self.site_dir, "date=*", "*.parquet")):
+            self.import_csv()
+        frame = self.read()
+        if frame.empty:
+            return frame
+        frame = self.latest(frame.drop(columns=["date"]))
+        self.write_latest(frame)
+        return _typed(frame)
+
+    @span("write")
+    def save(self, merged, incoming=None):
+        incoming = merged if incoming is None else incoming
+        self.append(incoming)
+        if not incoming.empty:
+            self.write_latest(self.latest(pd.concat([self.history(), incoming], ignore_index=True)))
+            self._history = None
+        if self.export:
+            export_csv(merged, self.csv_path)
+
+
+def _typed(frame):
+    """Parquet keeps every scraped field as text; columns that are all numbers get a numeric type back."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    for column in frame.columns:
+        numbers = pd.to_numeric(frame[column], errors="coerce")
+        if numbers.notna().sum() == frame[column].notna().sum():
+            frame[column] = numbers
+    return frame
+
+
+SQLITE_PATH_ENV = "SCRAPE_SQLITE_PATH"
+DEFAULT_SQLITE_PATH = "web-scraping/listings.sqlite3"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS listings (
+    id INTEGER PRIMARY KEY,
+    site TEXT NOT NULL,
+    key TEXT NOT NULL,
+    data TEXT NOT NULL,
+    price TEXT,
+    first_seen TEXT NOT NULL,
+    last_seen TEXT NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS listings_site_key ON listings (site, key);
+
+CREATE TABLE IF NOT EXISTS observations (
+    id INTEGER PRIMARY KEY,
+    listing_id INTEGER NOT NULL REFERENCES listings (id),
+    observed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS observations_listing ON observations (listing_id, observed_at);
+
+CREATE TABLE IF NOT EXISTS prices (
+    listing_id INTEGER NOT NULL REFERENCES listings (id),
+    observed_at TEXT NOT NULL,
+    price TEXT,
+    PRIMARY KEY (listing_id, observed_at)
+);
+"""
+
+UPSERT_LISTING = """
+INSERT INTO listings (site, key, data, price, first_seen, last_seen) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (site, key) DO UPDATE SET data = excluded.data, price = excluded.price, last_seen = excluded.last_seen
+"""
+
+
+def normalise_key(*values):
+    """One string per listing: each key part stripped and whitespace-collapsed, joined by a unit separator."""
+    return "\x1f".join(re.sub(r"\s+", " ", str(value)).strip() for value in values)
+
+
+def _records(frame):
+    # NaN from pandas is not valid JSON; store missing values as null
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
+class SqliteStore(HistoryStore):
+    """All sites' listings in one SQLite file: the latest row per listing, every sighting, and price changes.
+
+    The unique (site, key) index makes dedup an upsert and new-item checks a
+    join of the run's keys against it, so a run only touches the rows it
+    scraped: contains() and merge() never read the rest of the history. Each
+    write is a single transaction with batched INSERT ... ON CONFLICT statements.
+    """
+
+    def __init__(self, site, csv_path, key, path=None, price_column="price", export=None):
+        self.site = site
+        self.csv_path = csv_path
+        self.key = [key] if isinstance(key, str) else list(key)
+        self.path = path or os.environ.get(SQLITE_PATH_ENV, DEFAULT_SQLITE_PATH)
+        self.price_column = price_column
+        self.export = os.environ.get(CSV_EXPORT_ENV, "0") == "1" if export is None else export
+
+    @property
+    def location(self):
+        return self.csv_path if self.export else self.path
+
+    def state(self):
+        """Listing count and latest sighting of this site, which every merge moves."""
+        if not os.path.exists(self.path):
+            return None
+        conn = self.connect()
+        try:
+            listings, last_seen = conn.execute(
+                "SELECT COUNT(*), MAX(last_seen) FROM listings WHERE site = ?", (self.site,)
+            ).fetchone()
+        finally:
+            conn.close()
+        return f"{listings} {last_seen}" if listings else None
+
+    def connect(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Autocommit mode so transactions are explicit; jobs running in parallel wait on the write lock
+        conn = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(SCHEMA)
+        return conn
+
+    def frame_keys(self, frame):
+        # Same key as merge_history: links reduce to their listing_key, everything compares as text
+        keys = key_index(frame, self.key)
+        return [normalise_key(*(values if isinstance(values, tuple) else (values,))) for values in keys]
+
+    def import_csv(self, conn):
+        """Seed the site from its existing CSV the first time this backend is used."""
+        if conn.execute("SELECT 1 FROM listings WHERE site = ? LIMIT 1", (self.site,)).fetchone() is not None:
+            return
+        if os.path.exists(self.csv_path):
+            modified = datetime.fromtimestamp(os.path.getmtime(self.csv_path), timezone.utc)
+            self._upsert(conn, pd.read_csv(self.csv_path), modified.isoformat(timespec="milliseconds"))
+
+    def _stage(self, conn, keys):
+        # The run's keys go into a temp table, so every lookup against the history is one indexed join
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS run_keys (key TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM run_keys")
+        conn.executemany("INSERT OR IGNORE INTO run_keys (key) VALUES (?)", [(key,) for key in keys])
+
+    def _stored(self, conn, column):
+        """{key: column} for this site's listings whose key is staged in run_keys."""
+        return dict(conn.execute(
+            f"SELECT l.key, l.{column} FROM listings l JOIN run_keys r ON l.key = r.key WHERE l.site = ?", (self.site,)
+        ).fetchall())
+
+    def contains(self, frame):
+        """Boolean Series over frame's rows: whose key is already stored for this site."""
+        keys = self.frame_keys(frame)
+        conn = self.connect()
+        try:
+            self.import_csv(conn)
+            conn.execute("BEGIN")
+            self._stage(conn, keys)
+            found = self._stored(conn, "id")
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+        return pd.Series([key in found for key in keys], index=frame.index)
+
+    def _read(self, conn):
+        rows = conn.execute("SELECT key, data FROM listings WHERE site = ? ORDER BY id", (self.site,)).fetchall()
+        return [key for key, _ in rows], pd.DataFrame([json.loads(data) for _, data in rows])
+
+    @span("load")
+    def load(self):
+        """Latest row per listing for this site, in first-seen order."""
+        conn = self.connect()
+        try:
+            self.import_csv(conn)
+            return self._read(conn)[1]
+        finally:
+            conn.close()
+
+    def _upsert(self, conn, frame, observed_at):
+        """Write frame's rows in one transaction; returns {key: price} of those already stored before it."""
+        if frame.empty:
+            return {}
+        frame = frame[~key_index(frame, self.key).duplicated(keep="last")]
+        keys = self.frame_keys(frame)
+        records = _records(frame)
+        prices = [None if row.get(self.price_column) is None else str(row[self.price_column]) for row in records]
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Remember the current price of every listing we're about to touch
+            self._stage(conn, keys)
+            previous = self._stored(conn, "price")
+
+            conn.executemany(UPSERT_LISTING, [
+                (self.site, key, json.dumps(row, ensure_ascii=False, default=str), price, observed_at, observed_at)
+                for key, row, price in zip(keys, records, prices)
+            ])
+            ids = self._stored(conn, "id")
+
+            conn.executemany(
+                "INSERT INTO observations (listing_id, observed_at) VALUES (?, ?)",
+                [(ids[key], observed_at) for key in keys],
+            )
+            # A price point is recorded for new listings and whenever the price moves
+            conn.executemany(
+                "INSERT INTO prices (listing_id, observed_at, price) VALUES (?, ?, ?) ON CONFLICT (listing_id, observed_at) DO UPDATE SET price = excluded.price",
+                [
+                    (ids[key], observed_at, price)
+                    for key, price in zip(keys, prices)
+                    if self.price_column in frame.columns and (key not in previous or previous[key] != price)
+                ],
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return previous
+
+    @span("write")
+    def save(self, merged, incoming=None):
+        conn = self.connect()
+        try:
+            self._upsert(conn, merged if incoming is None else incoming, datetime.now(timezone.utc).isoformat(timespec="milliseconds"))
+        finally:
+            conn.close()
+        if self.export:
+            export_csv(merged, self.csv_path)
+
+    @span("merge")
+    def merge(self, incoming, full=False, compare=(), status_column="status", labels=None, keep_removed=True):
+        """merge_history() done by the database: statuses come from the upsert's join, counts from the index.
+
+        Diff.merged is read back from the database only with full (or the CSV
+        export on); otherwise it holds the incoming rows with their statuses.
+        compare needs the stored rows, so it goes through the loaded merge.
+        """
+        if compare:
+            return super().merge(incoming, compare=compare, status_column=status_column, labels=labels, keep_removed=keep_removed)
+        full = full or self.export
+        incoming = incoming[~key_index(incoming, self.key).duplicated(keep="last")].reset_index(drop=True)
+        keys = self.frame_keys(incoming)
+        conn = self.connect()
+        try:
+            self.import_csv(conn)
+            (stored,) = conn.execute("SELECT COUNT(*) FROM listings WHERE site = ?", (self.site,)).fetchone()
+            with span("write"):
+                previous = self._upsert(conn, incoming, datetime.now(timezone.utc).isoformat(timespec="milliseconds"))
+            status = {key: EXISTING if key in previous else NEW for key in keys}
+            if full:
+                history_keys, merged = self._read(conn)
+                statuses = [status.get(key, REMOVED) for key in history_keys]
+                if not keep_removed:
+                    merged = merged[[value != REMOVED for value in statuses]].reset_index(drop=True)
+                    statuses = [value for value in statuses if value != REMOVED]
+            else:
+                merged, statuses = incoming.copy(), [status[key] for key in keys]
+        finally:
+            conn.close()
+
+        counts = dict.fromkeys(STATUSES, 0)
+        counts[EXISTING] = len(previous)
+        counts[NEW] = len(keys) - len(previous)
+        counts[REMOVED] = stored - len(previous)
+        if status_column:
+            names = {s: (labels or {}).get(s, s) for s in STATUSES}
+            merged[status_column] = [names[value] for value in statuses]
+        if self.export:
+            export_csv(merged, self.csv_path)
+        return Diff(merged, counts)
+
+
+def _compare(field, op, value):
+    if op == "in":
+        return field.isin(list(value))
+    ops = {
+        "=": field.__eq__, "==": field.__eq__, "!=": field.__ne__,
+        "<": field.__lt__, "<=": field.__le__, ">": field.__gt__, ">=": field.__ge__,
+    }
+    return ops[op](value)
+
+
+def export_csv(frame, csv_path):
+    """Write a full CSV snapshot (for the committed files and for opening in Excel)."""
+    directory = os.path.dirname(csv_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    frame.to_csv(csv_path, index=False)
+
+
+BACKENDS = {"csv": CsvStore, "parquet": ParquetStore, "sqlite": SqliteStore}
+
+
+def history_store(site, csv_path, key, backend=None, price_column="price"):
+    """Open the scrape history for a site with the configured backend (SCRAPE_STORAGE).
+
+    price_column names the column sqlite tracks price changes on.
+    """
+    backend = backend or os.environ.get(STORAGE_ENV, "csv")
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown storage backend {backend!r}; expected one of {', '.join(BACKENDS)}")
+    if backend == "sqlite":
+        return SqliteStore(site, csv_path, key, price_column=price_column)
+    return BACKENDS[backend](site, csv_path, key)
@@ -0,0 +1,101 @@
+import re
+from functools import lru_cache
+from urllib.parse import parse_qsl, urlencode, urljoin, urlsplit, urlunsplit
+
+# Query parameters that only describe how a visitor got to a listing, never which listing it is
+TRACKING_PARAMS = re.compile(
+    r"^(utm_.*|fbclid|gclid|dclid|msclkid|mc_[a-z]+|ref|ref_src|referral_code|referral_story_type|__tn__|__cft__.*)$"
+)
+
+
+class SiteRule:
+    """How one host's listing URLs are canonicalised.
+
+    keep: query parameters that identify the listing (None keeps everything not
+    tracking-related, () drops the query entirely). id_pattern: regex whose first
+    group is the listing ID within the path or query. host: rewrite to this host.
+    """
+
+    def __init__(self, keep=None, id_pattern=None, host=None):
+        self.keep = keep
+        self.id_pattern = re.compile(id_pattern) if id_pattern else None
+        self.host = host
+
+
+DEFAULT_RULE = SiteRule()
+
+SITE_RULES = {
+    # /classifieds/102061-zara-shoes?utm_source=...&utm_position=1
+    "engocha.com": SiteRule(keep=(), id_pattern=r"/classifieds/(\d+)"),
+    # /arada/shoes/naked-wolfe-...-moNURWgk0zNMw1pJTeKJiA4m.html?page=1&pos=1&cur_pos=1&ads_per_page=...
+    "jiji.com.et": SiteRule(keep=(), id_pattern=r"-([A-Za-z0-9]{16,})\.html$"),
+    # /marketplace/item/1440224536960671/?ref=marketplace_profile&__tn__=!:D
+    "facebook.com": SiteRule(keep=(), id_pattern=r"/marketplace/item/(\d+)", host="www.facebook.com"),
+    # index.php?route=product/product&path=99_86&product_id=5034 (path is the category trail)
+    "helloomarket.com": SiteRule(keep=("route", "product_id"), id_pattern=r"[?&]product_id=(\d+)"),
+}
+
+
+def site_rule(host):
+    # www. and web. prefixes share the bare domain's rule
+    host = host.lower()
+    while host:
+        if host in SITE_RULES:
+            return SITE_RULES[host]
+        _, _, host = host.partition(".")
+    return DEFAULT_RULE
+
+
+@lru_cache(maxsize=65536)
+def canonical_url(url, base=None):
+    """Absolute URL with tracking parameters, fragment and host case normalised away.
+
+    Relative links are resolved against base, the way the jiji scrapers build
+    full_link from an advert's href. Values that aren't URLs ('No link') pass through.
+    """
+    if not isinstance(url, str) or not url.strip():
+        return url
+    url = url.strip()
+    if base:
+        url = urljoin(base, url)
+    parts = urlsplit(url)
+    if not parts.scheme or not parts.netloc:
+        return url
+
+    host = parts.netloc.lower()
+    rule = site_rule(host)
+    query = parse_qsl(parts.query, keep_blank_values=True)
+    if rule.keep is None:
+        query = [(k, v) for k, v in query if not TRACKING_PARAMS.match(k)]
+    else:
+        query = [(k, v) for k, v in query if k in rule.keep]
+    return urlunsplit((parts.scheme.lower(), rule.host or host, parts.path or "/", urlencode(sorted(query), safe="/"), ""))
+
+
+def listing_id(url):
+    """The site's own listing ID (e.g. '102061' for an engocha classified), or None if it has none."""
+    url = canonical_url(url)
+    if not isinstance(url, str):
+        return None
+    parts = urlsplit(url)
+    rule = site_rule(parts.netloc)
+    if rule.id_pattern:
+        match = rule.id_pattern.search(url)
+        if match:
+            return match.group(1)
+    return None
+
+
+@lru_cache(maxsize=65536)
+def listing_key(url):
+    """Primary key for a listing link: 'host:id' when the site has IDs, else the canonical URL.
+
+    Keyed on the ID, a listing stays the same row when its slug or tracking
+    parameters change between scrapes.
+    """
+    canonical = canonical_url(url)
+    ident = listing_id(canonical)
+    if ident is None:
+        return canonical
+    host = urlsplit(canonical).netloc
+    return f"{host.removeprefix('www.')}:{ident}"
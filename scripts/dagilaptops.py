@@ -1,7 +1,12 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os  # To ensure the output directory exists
+from common.fetch import fetch
+from common.fingerprint import skip_unchanged_page
+from common.diff import CHANGED, EXISTING, merge_history
+from common.metrics import begin_run, count, span
+
+begin_run("dagilaptops", "web-scraping/ecommerce")
 
 # Set headers to mimic a browser request
 headers = {
@@ -12,7 +17,7 @@ headers = {
 url = 'https://dagicomputers.com/product-category/hp/'
 
 # Send a GET request to fetch the HTML page
-response = requests.get(url, headers=headers)
+response = fetch(url, headers=headers)
 
 # Check if the request was successful
 if response.status_code == 200:
@@ -21,6 +26,13 @@ else:
     print(f"Failed to retrieve the page. Status code: {response.status_code}")
     exit()
 
+# Nothing to do when the laptops are as they were on the last run
+prints = skip_unchanged_page(
+    'dagilaptops', url, response.text,
+    outputs=['web-scraping/ecommerce/dagi_laptops.csv'],
+    container=('li', {'class': 'product'}),
+)
+
 # Parse the HTML content with BeautifulSoup
 soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -58,6 +70,7 @@ for laptop in laptops:
 
 # Convert the list of dictionaries to a DataFrame
 df = pd.DataFrame(laptop_data)
+count("items", len(df))
 
 # Define the output directory and file path
 output_dir = 'web-scraping/ecommerce/'
@@ -71,20 +84,10 @@ if os.path.exists(output_file_path):
     # Load the previous CSV data
     previous_df = pd.read_csv(output_file_path)
     
-    # Merge the previous and current DataFrames on the 'link' column to detect changes
-    merged_df = pd.merge(previous_df, df, on='link', how='right', suffixes=('_old', '_new'), indicator=True)
-
-    # Initialize the 'highlight' column
-    merged_df['highlight'] = 'New'  # By default, all rows are considered new
-
-    # Mark rows as 'Updated' if there's a difference in the price or title
-    merged_df['highlight'] = merged_df.apply(
-        lambda row: 'Updated' if row['_merge'] == 'both' and (row['price_old'] != row['price_new'] or row['title_old'] != row['title_new']) else row['highlight'],
-        axis=1
-    )
-
-    # Remove the merged columns that are not needed
-    final_df = merged_df.drop(columns=['_merge', 'price_old', 'title_old', 'price_new', 'title_new'])
+    # Compare the previous and current data on the 'link' column to detect changes; only current
+    # listings are kept, marked 'Updated' if their price or title changed and 'New' otherwise
+    final_df, _ = merge_history(previous_df, df, 'link', compare=['price', 'title'], status_column='highlight',
+                                labels={EXISTING: 'New', CHANGED: 'Updated'}, keep_removed=False)
 
 else:
     # If the CSV doesn't exist, it's the first time running the scraper, so all rows are new
@@ -92,6 +95,8 @@ else:
     final_df['highlight'] = 'New'
 
 # Save the updated data with the 'highlight' column
-final_df.to_csv(output_file_path, index=False)
+with span("write"):
+    final_df.to_csv(output_file_path, index=False)
 
 print(f"Scraping completed and data saved to '{output_file_path}'")
+prints.save()
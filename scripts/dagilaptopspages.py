@@ -1,7 +1,13 @@
-import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os  # To ensure the output directory exists
+from common.pagination import prefetch_pages
+from common.diff import CAPITALISED
+from common.storage import history_store
+from common.fingerprint import Fingerprints, fingerprint
+from common.metrics import begin_run, count
+
+begin_run("dagilaptopspages", "web-scraping/ecommerce")
 
 # Set headers to mimic a browser request
 headers = {
@@ -14,15 +20,29 @@ base_url = 'https://dagicomputers.com/product-category/hp/page/{page}/'
 # List to store the product data
 data = []
 
-# Loop through pages 1 to 19
-for page in range(1, 20):  # Assuming there are 19 pages. Adjust if needed.
-    url = base_url.format(page=page)
-    
-    # Fetch the page content
-    response = requests.get(url, headers=headers)
-    
+# Path to the existing CSV file (if it exists)
+output_path = 'web-scraping/ecommerce/dagi_laptops_multiple_pages.csv'
+
+# The history store (empty on the first run, when every row is new)
+store = history_store("dagilaptopspages", output_path, 'link')
+
+# Page digests of the last run, to tell whether any laptop changed since
+prints = Fingerprints('dagilaptopspages', store=store)
+
+# At most 19 pages, fetched a few ahead of the one being parsed; the first missing page ends the
+# crawl, so nothing past the real last page is scheduled and rate-limited for nothing
+last_page = 19  # Assuming there are 19 pages. Adjust if needed.
+
+for page, pending in prefetch_pages(lambda page: base_url.format(page=page), stop=last_page, headers=headers):
+    # Wait for this page's content
+    response = pending.result()
+    if response.status_code == 404:
+        print(f"Page {page} does not exist. Stopping scrape.")
+        break
+
     if response.status_code == 200:
         print(f"Page {page} fetched successfully")
+        prints.check(base_url.format(page=page), fingerprint(response.text, ('li', {'class': 'product'})))
         
         # Parse the page content with BeautifulSoup
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -45,37 +65,20 @@ for page in range(1, 20):  # Assuming there are 19 pages. Adjust if needed.
     else:
         print(f"Failed to retrieve page {page}. Status code: {response.status_code}")
 
+# The merge would leave the history as it is when no page changed
+prints.exit_if_unchanged()
+
 # Convert the data to a DataFrame
 df_new = pd.DataFrame(data)
+count("items", len(df_new))
 
 # Ensure the output directory exists
-output_dir = 'web-scraping/ecommerce/'
+output_dir = os.path.dirname(output_path)
 os.makedirs(output_dir, exist_ok=True)
 
-# Path to the existing CSV file (if it exists)
-output_path = os.path.join(output_dir, 'dagi_laptops_multiple_pages.csv')
-
-# Check if the file already exists
-if os.path.exists(output_path):
-    # Read the existing data
-    df_existing = pd.read_csv(output_path)
-    
-    # Mark new rows with an additional 'highlight' column
-    # Compare the new data with the existing one, marking new rows as "New"
-    df_new['highlight'] = df_new.apply(lambda row: 'New' if not any(
-        df_existing['link'] == row['link']) else 'Existing', axis=1)
-
-    # Concatenate the new data with the existing data
-    df_combined = pd.concat([df_existing, df_new], ignore_index=True)
-    
-    # Remove duplicate entries based on the product link (if any)
-    df_combined = df_combined.drop_duplicates(subset='link', keep='last')
-else:
-    # If no file exists, just use the new data
-    df_new['highlight'] = 'New'  # Mark all rows as new
-    df_combined = df_new
-
-# Save the combined data to the CSV file
-df_combined.to_csv(output_path, index=False)
+# Merge on the product link, mark rows in a 'highlight' column as New, Existing or Removed,
+# and save the combined data to the history store and CSV file
+store.merge(df_new, status_column='highlight', labels=CAPITALISED)
 
-print(f"Scraping completed and data saved to '{output_path}'")
+print(f"Scraping completed and data saved to '{store.location}'")
+prints.save()
@@ -1,15 +1,26 @@
 import csv
 import os
 import re
-import time
 from collections import Counter
-from playwright.sync_api import sync_playwright
-import matplotlib.pyplot as plt
+from common.browser import launch_browser, new_context
+from common.plotting import PYPLOT_LOCK, pyplot
+from common.fingerprint import Fingerprints, rows_fingerprint
+from common.scroll import ScrollSession
+from common.urls import canonical_url
+from common.metrics import instrumented, span
 
 # Constants for price thresholds
 MIN_PRICE = 1800
 MAX_PRICE = 3500
 
+# Fields read from each marketplace listing anchor; the link is the anchor's own href
+LISTING_FIELDS = {
+    'title': 'span.x1lliihq.x6ikm8r.x10wlt62.x1n2onr6',
+    'price': 'span.x193iq5w',
+    'location': 'span.x1lliihq.x6ikm8r.x10wlt62.xlyipyv',
+    'link': (None, '@href'),
+}
+
 # Define the main output path
 output_path = "eco/eph"  # Base output folder
 
@@ -36,6 +47,7 @@ def load_popular_titles(csv_file):
         return []
 
 # Function to save data to CSV
+@span("write")
 def save_to_csv(item_details, filename="eph.csv"):
     ensure_output_directory()  # Ensure the output directory exists
     try:
@@ -55,6 +67,7 @@ def save_to_csv(item_details, filename="eph.csv"):
         write_to_file("errors.log", f"Error saving data to CSV: {e}")
 
 # Function to save popular products to CSV
+@span("write")
 def save_popular_products_to_csv(popular_products, filename="popular_products.csv"):
     ensure_output_directory()  # Ensure the output directory exists
     try:
@@ -74,7 +87,7 @@ def save_popular_products_to_csv(popular_products, filename="popular_products.cs
         write_to_file("errors.log", f"Error saving popular products to CSV: {e}")
 
 # Function to scrape Facebook Marketplace
-def scrape_facebook_marketplace(min_items=50, keywords=None):
+def scrape_facebook_marketplace(browser, min_items=50, keywords=None):
     if keywords is None:
         keywords = ["leather shoes", "boots", "shoes for men", "shoes for women"]
 
@@ -82,64 +95,52 @@ def scrape_facebook_marketplace(min_items=50, keywords=None):
     prices = []
     titles = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
-        page.goto("https://web.facebook.com/marketplace/profile/100076346097013/")
-        page.wait_for_selector('a.x1i10hfl', timeout=10000)
-
-        try:
-            # Scraping loop
-            while len(item_details) < min_items:
-                items = page.query_selector_all('a.x1i10hfl')
-
-                for item in items:
-                    title_element = item.query_selector('span.x1lliihq.x6ikm8r.x10wlt62.x1n2onr6')
-                    title = title_element.inner_text() if title_element else None
+    # Use a context of our own so the shared browser stays clean for other scrapers
+    context = new_context(browser, "eph")
+    page = context.new_page()
+    page.goto("https://web.facebook.com/marketplace/profile/100076346097013/")
+    page.wait_for_selector('a.x1i10hfl', timeout=10000)
 
-                    price_element = item.query_selector('span.x193iq5w')
-                    price = price_element.inner_text() if price_element else None
-
-                    location_element = item.query_selector('span.x1lliihq.x6ikm8r.x10wlt62.xlyipyv')
-                    location = location_element.inner_text() if location_element else None
-
-                    link = item.get_attribute('href')
-                    if link and 'item' in link:
-                        if not link.startswith('https://'):
-                            link = f"https://www.facebook.com{link}"
-                        if '/item/' not in link:
+    try:
+        # Scraping loop: each batch holds only the listings that appeared since the last scroll,
+        # so listings already walked are never re-read (or re-appended) on later scrolls
+        session = ScrollSession(page, 'a.x1i10hfl', LISTING_FIELDS, strip=False)
+        for items in session.batches():
+            for item in items:
+                title = item['title']
+                price = item['price']
+                location = item['location']
+                link = item['link']
+                if link and 'item' in link:
+                    link = canonical_url(link, base="https://www.facebook.com")
+                    if '/item/' not in link:
+                        continue
+
+                if title and any(keyword.lower() in title.lower() for keyword in keywords):
+                    if price and price.startswith("ETB"):
+                        try:
+                            price_value = int(price.split('ETB')[1].strip().replace(',', ''))
+                            if MIN_PRICE <= price_value <= MAX_PRICE:
+                                if title not in ["View profile", "Create new listing", "See More", "Sell"] and location and link:
+                                    if not any(keyword in title for keyword in ["California", "Sausalito", "Daly City", "Brisbane"]):
+                                        item_details.append({
+                                            'title': title,
+                                            'price': price,
+                                            'location': location,
+                                            'link': link
+                                        })
+                                        prices.append(price_value)
+                                        titles.append(title)
+
+                        except ValueError:
+                            write_to_file("errors.log", f"Skipping item with invalid price: {price}")
                             continue
 
-                    if title and any(keyword.lower() in title.lower() for keyword in keywords):
-                        if price and price.startswith("ETB"):
-                            try:
-                                price_value = int(price.split('ETB')[1].strip().replace(',', ''))
-                                if MIN_PRICE <= price_value <= MAX_PRICE:
-                                    if title not in ["View profile", "Create new listing", "See More", "Sell"] and location and link:
-                                        if not any(keyword in title for keyword in ["California", "Sausalito", "Daly City", "Brisbane"]):
-                                            item_details.append({
-                                                'title': title,
-                                                'price': price,
-                                                'location': location,
-                                                'link': link
-                                            })
-                                            prices.append(price_value)
-                                            titles.append(title)
-
-                            except ValueError:
-                                write_to_file("errors.log", f"Skipping item with invalid price: {price}")
-                                continue
-
-                if len(item_details) >= min_items:
-                    break
-
-                page.evaluate("window.scrollBy(0, window.innerHeight);")
-                time.sleep(2)
-                if not page.query_selector('a.x1i10hfl'):
-                    break
-
-        finally:
-            browser.close()  # Ensure that the browser closes even if there's an error.
+            if len(item_details) >= min_items:
+                break
+
+    finally:
+        context.close()  # Ensure that the context closes even if there's an error.
 
     return item_details, prices, titles
 
@@ -162,6 +163,7 @@ def generate_dynamic_trend_analysis(prices, item_details):
     ensure_output_directory()  # Ensure the output directory exists
     dominant_category = ''
     try:
+        plt = pyplot()
         plt.figure(figsize=(10, 6))
         n, bins, patches = plt.hist(prices, bins=20, color='skyblue', edgecolor='black')
         plt.title('Price Distribution of Shoes (1800 - 3500 ETB)')
@@ -247,20 +249,35 @@ def generate_recommendations(dominant_category):
     return recommendations
 
 # Run the entire processing workflow
-ensure_output_directory()  # Ensure the output directory exists
-keywords = ["leather shoes", "boots", "shoes for men", "shoes for women"]
+@instrumented("eph", "eco/eph")
+def scrape(browser):
+    ensure_output_directory()  # Ensure the output directory exists
+    keywords = ["leather shoes", "boots", "shoes for men", "shoes for women"]
+
+    # Step 1: Scrape Marketplace Data
+    items_data, prices_data, titles_data = scrape_facebook_marketplace(browser, keywords=keywords)
+
+    # The CSV is appended to, so a run that found the same listings as the last one would only repeat them
+    prints = Fingerprints("eph", outputs=[os.path.join(output_path, "eph.csv")])
+    prints.check(" | ".join(keywords), rows_fingerprint(items_data))
+    if prints.up_to_date():
+        return
+
+    # Save the scraped data to CSV
+    save_to_csv(items_data)
 
-# Step 1: Scrape Marketplace Data
-items_data, prices_data, titles_data = scrape_facebook_marketplace(keywords=keywords)
+    # Generate dynamic trend analysis
+    with PYPLOT_LOCK:
+        dominant_category = generate_dynamic_trend_analysis(prices_data, items_data)
 
-# Save the scraped data to CSV
-save_to_csv(items_data)
+    # Extract popular products based on title frequency after trend analysis
+    popular_products = extract_popular_products_after_analysis(titles_data, items_data)
 
-# Generate dynamic trend analysis
-dominant_category = generate_dynamic_trend_analysis(prices_data, items_data)
+    # Save popular products to a CSV file
+    save_popular_products_to_csv(popular_products)
+    prints.save()
 
-# Extract popular products based on title frequency after trend analysis
-popular_products = extract_popular_products_after_analysis(titles_data, items_data)
 
-# Save popular products to a CSV file
-save_popular_products_to_csv(popular_products)
+if __name__ == "__main__":
+    with launch_browser() as browser:
+        scrape(browser)
@@ -2,6 +2,13 @@ import requests
 from bs4 import BeautifulSoup
 import pandas as pd
 import os
+from common.pagination import prefetch_pages
+from common.known import KnownIndex
+from common.storage import history_store
+from common.fingerprint import Fingerprints, fingerprint
+from common.metrics import begin_run, count
+
+begin_run("geez", "web-scraping/ecommerce")
 
 # Headers to simulate a real browser request
 headers = {
@@ -17,28 +24,29 @@ data = []
 # Path for the output CSV file
 output_path = 'web-scraping/ecommerce/geez_product.csv'
 
-# Load existing data if the file exists
-existing_data = pd.read_csv(output_path) if os.path.exists(output_path) else pd.DataFrame()
-existing_titles = set(existing_data['title']) if not existing_data.empty else set()
-
-# Start scraping from page 1, and continue until a 404 error is encountered
-page = 1
-while True:
-    url = base_url.format(page=page)
-
-    # Send the HTTP request with headers
+# The history store; titles already in it are looked up once the scrape is done
+store = history_store("geez", output_path, 'title')
+# Titles seen earlier in this run
+known_titles = KnownIndex('title')
+# Each page's product grid is compared with the last run's
+prints = Fingerprints('geez', store=store)
+
+# Start scraping from page 1, and continue until a 404 error is encountered;
+# the next few pages are fetched ahead while the current one is parsed
+for page, pending in prefetch_pages(lambda page: base_url.format(page=page), headers=headers):
+    # Wait for this page's response
     try:
-        response = requests.get(url, headers=headers)
+        response = pending.result()
         response.raise_for_status()  # Raise an exception for HTTP errors (4xx, 5xx)
         print(f"Page {page} fetched successfully!")
+        prints.check(base_url.format(page=page), fingerprint(response.text, ('div', {'class': 'product-item'})))
     except requests.exceptions.RequestException as e:
         # Stop if a 404 error is encountered (page doesn't exist)
-        if response.status_code == 404:
+        if e.response is not None and e.response.status_code == 404:
             print(f"Page {page} does not exist. Stopping scrape.")
             break
         else:
-            print(f"Failed to retrieve page {page}. Status code: {response.status_code} - {e}")
-            page += 1
+            print(f"Failed to retrieve page {page}: {e}")
             continue
 
     # Parse the content of the page
@@ -66,8 +74,8 @@ while True:
         link_tag = item.find('a', href=True)
         link = link_tag['href'] if link_tag else 'No link found'
 
-        # Check if this product is already in the existing data
-        highlight = 'new' if title not in existing_titles else 'existing'
+        # Check if this product already came up in this run
+        highlight = known_titles.mark(title)
 
         # Append data to the list
         data.append({
@@ -77,8 +85,8 @@ while True:
             'highlight': highlight
         })
 
-    # Move to the next page
-    page += 1
+# Stop here if no page changed since the last run
+prints.exit_if_unchanged()
 
 # Check if data was extracted before proceeding
 if len(data) == 0:
@@ -87,18 +95,19 @@ if len(data) == 0:
 
 # Convert the list of data into a DataFrame
 df = pd.DataFrame(data)
+count("items", len(df))
+
+# Products already in the history are existing as well
+df.loc[store.contains(df), 'highlight'] = 'existing'
 
 # Ensure the target directory exists
 output_dir = os.path.dirname(output_path)
 if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
-# Save the data to a CSV file, keeping existing data and adding new
-if not existing_data.empty:
-    # Merge new data with existing data, ensuring no duplicate titles
-    df = pd.concat([existing_data, df]).drop_duplicates(subset=['title'], keep='last')
-
-# Save to CSV
-df.to_csv(output_path, index=False)
+# Save the data, keeping existing data and adding new
+# Merge new data into the history store (and CSV), ensuring no duplicate titles
+store.merge(df, status_column=None)
 
-print(f"Scraping completed and data saved to '{output_path}'")
+print(f"Scraping completed and data saved to '{store.location}'")
+prints.save()
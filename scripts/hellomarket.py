@@ -1,7 +1,11 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import os  # To handle directory creation
+from common.fetch import fetch
+from common.fingerprint import skip_unchanged_page
+from common.output import write_rows
+from common.metrics import begin_run, count
+
+begin_run("hellomarket", "web-scraping/ecommerce")
 
 # Define the URL of the page to scrape
 url = 'https://helloomarket.com/index.php?route=product/category&path=82'
@@ -12,7 +16,7 @@ headers = {
 }
 
 # Send the HTTP request with the headers
-response = requests.get(url, headers=headers)
+response = fetch(url, headers=headers)
 
 # Check if the page was fetched successfully
 if response.status_code == 200:
@@ -21,6 +25,13 @@ else:
     print(f"Failed to retrieve the page. Status code: {response.status_code}")
     exit()  # Exit the script if the request fails
 
+# Nothing to do when the product list is as it was on the last run
+prints = skip_unchanged_page(
+    'hellomarket', url, response.text,
+    outputs=['web-scraping/ecommerce/hellomarket.csv'],
+    container=('div', {'class': 'product-layout product-list col-xs-12'}),
+)
+
 # Parse the content of the page using BeautifulSoup
 soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -56,9 +67,6 @@ if not product_data:
     print("No products found on the page.")
     exit()  # Exit the script if no products were found
 
-# Convert the list of product data into a DataFrame
-df = pd.DataFrame(product_data)
-
 # Define the path for the output CSV file
 output_path = 'web-scraping/ecommerce/hellomarket.csv'
 
@@ -68,6 +76,8 @@ if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
 # Save the data to a CSV file
-df.to_csv(output_path, index=False)
+count("items", len(product_data))
+write_rows(output_path, product_data)
 
 print(f"Scraping completed and data saved to '{output_path}'")
+prints.save()
@@ -1,7 +1,11 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import os  # To handle directory creation
+from common.fetch import fetch
+from common.output import write_rows
+from common.metrics import begin_run, count
+
+begin_run("hellomarketpage", "web-scraping/ecommerce")
 
 # Headers to simulate a real browser request (to avoid anti-scraping measures)
 headers = {
@@ -20,7 +24,7 @@ for page in range(1, 2):  # Change the range for more pages if necessary
     
     # Send the HTTP request with headers
     try:
-        response = requests.get(url, headers=headers)
+        response = fetch(url, headers=headers)
         response.raise_for_status()  # Raise an exception for HTTP errors (4xx, 5xx)
         print(f"Page {page} fetched successfully!")
     except requests.exceptions.RequestException as e:
@@ -56,9 +60,6 @@ if len(data) == 0:
     print("No products found on the page.")
     exit()  # Exit the script if no products are found
 
-# Convert the list of data into a DataFrame
-df = pd.DataFrame(data)
-
 # Define the path for the output CSV file
 output_path = 'web-scraping/ecommerce/hellomarket2.csv'
 
@@ -68,6 +69,7 @@ if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
 # Save the data to a CSV file
-df.to_csv(output_path, index=False)
+count("items", len(data))
+write_rows(output_path, data)
 
 print(f"Scraping completed and data saved to '{output_path}'")
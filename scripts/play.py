@@ -1,7 +1,10 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 from fake_useragent import UserAgent
+from common.fetch import fetch
+from common.output import write_rows
+from common.metrics import begin_run, count
+
+begin_run("play", "web-scraping/ecommerce")
 
 # Install fake_useragent if not already installed
 # pip install fake-useragent
@@ -25,7 +28,7 @@ def get_text(tag):
     return tag.get_text(strip=True) if tag else 'No data found'
 
 # Fetch the webpage
-response = requests.get(url, headers=headers)
+response = fetch(url, headers=headers)
 
 # Check if the request was successful
 if response.status_code == 200:
@@ -59,8 +62,8 @@ if response.status_code == 200:
 
             # Save the data to a CSV file
             output_path = 'web-scraping/ecommerce/please.csv'
-            df = pd.DataFrame(product_data)
-            df.to_csv(output_path, index=False)
+            count("items", len(product_data))
+            write_rows(output_path, product_data)
             print(f"Scraping completed and data saved to '{output_path}'")
 else:
     print(f"Failed to retrieve the page. Status code: {response.status_code}")
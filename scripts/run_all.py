@@ -0,0 +1,35 @@
+import argparse
+import os
+import sys
+
+from common.jobs import PLAYWRIGHT_JOBS, find_jobs
+from common.runner import run_jobs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Playwright scrapers against one shared Chromium.")
+    parser.add_argument("sites", nargs="*", help="Job names to run (default: all registered jobs)")
+    parser.add_argument("--jobs", "-j", type=int, default=4, help="Maximum number of sites scraped at once")
+    parser.add_argument("--list", action="store_true", help="List registered jobs and exit")
+    parser.add_argument("--no-block", action="store_true", help="Load images, fonts, media and trackers instead of blocking them")
+    args = parser.parse_args(argv)
+
+    if args.no_block:
+        os.environ["SCRAPE_BLOCK_RESOURCES"] = "0"
+
+    if args.list:
+        for job in PLAYWRIGHT_JOBS:
+            print(job.name)
+        return 0
+
+    try:
+        jobs = find_jobs(args.sites)
+    except KeyError as e:
+        parser.error(e.args[0])
+
+    failed = run_jobs(jobs, max_workers=args.jobs)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
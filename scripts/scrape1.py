@@ -1,7 +1,12 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import os  # To handle directory creation
+from common.fetch import fetch
+from common.fingerprint import WOOCOMMERCE_CONTAINER, skip_unchanged_page
+from common.output import write_rows
+from common.metrics import begin_run, count
+
+begin_run("scrape1", "web-scraping/ecommerce")
 
 # URL of the page to scrape
 url = 'https://addisber.com/product-category/food-items/instant-foods/'
@@ -13,13 +18,20 @@ headers = {
 
 # Send the HTTP request with the headers
 try:
-    response = requests.get(url, headers=headers)
+    response = fetch(url, headers=headers)
     response.raise_for_status()  # This will raise an exception for HTTP errors (4xx, 5xx)
     print("Request successful!")
 except requests.exceptions.RequestException as e:
     print(f"Request failed: {e}")
     exit()  # Exit the script if the request fails
 
+# Nothing to do when the product grid is as it was on the last run
+prints = skip_unchanged_page(
+    'scrape1', url, response.text,
+    outputs=['web-scraping/ecommerce/addisber.com_food-items_instant-foods.csv'],
+    container=WOOCOMMERCE_CONTAINER,
+)
+
 # Parse the content of the page using BeautifulSoup
 soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -55,9 +67,6 @@ if len(product_data) == 0:
     print("No products found on the page.")
     exit()  # Exit the script if no products are found
 
-# Convert the list of product data into a DataFrame
-df = pd.DataFrame(product_data)
-
 # Define the path for the output CSV file
 output_path = 'web-scraping/ecommerce/addisber.com_food-items_instant-foods.csv'
 
@@ -67,6 +76,8 @@ if not os.path.exists(output_dir):
     os.makedirs(output_dir)
 
 # Save the data to a CSV file
-df.to_csv(output_path, index=False)
+count("items", len(product_data))
+write_rows(output_path, product_data)
 
 print(f"Scraping completed and data saved to '{output_path}'")
+prints.save()
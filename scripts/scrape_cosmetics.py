@@ -1,7 +1,11 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import os  # To ensure the output directory exists
+from common.fetch import fetch
+from common.fingerprint import WOOCOMMERCE_CONTAINER, skip_unchanged_page
+from common.output import write_rows
+from common.metrics import begin_run, count
+
+begin_run("scrape_cosmetics", "web-scraping/ecommerce")
 
 # URL of the page to scrape
 url = 'https://addisber.com/product-category/cosmetics/hair-care/'
@@ -12,12 +16,19 @@ headers = {
 }
 
 # Send the HTTP request with the headers
-response = requests.get(url, headers=headers)
+response = fetch(url, headers=headers)
 if response.status_code == 200:
     print("Page fetched successfully")
 else:
     print(f"Failed to retrieve the page. Status code: {response.status_code}")
 
+# Nothing to do when the product grid is as it was on the last run
+prints = skip_unchanged_page(
+    'scrape_cosmetics', url, response.text,
+    outputs=['web-scraping/ecommerce/addisber_cosmetics_hair_care.csv'],
+    container=WOOCOMMERCE_CONTAINER,
+)
+
 # Parse the content of the page using BeautifulSoup
 soup = BeautifulSoup(response.text, 'html.parser')
 
@@ -48,15 +59,14 @@ for product in products:
         'link': link
     })
 
-# Convert the list of product data into a DataFrame
-df = pd.DataFrame(data)
-
 # Ensure the output directory exists (GitHub Actions runs in a clean environment)
 output_dir = 'web-scraping/ecommerce/'
 os.makedirs(output_dir, exist_ok=True)
 
 # Save the data to a CSV file in the ecommerce folder
 output_path = os.path.join(output_dir, 'addisber_cosmetics_hair_care.csv')
-df.to_csv(output_path, index=False)
+count("items", len(data))
+write_rows(output_path, data)
 
 print(f"Scraping completed and data saved to {output_path}")
+prints.save()
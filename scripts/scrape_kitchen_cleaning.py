@@ -1,6 +1,9 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
+from common.fetch import fetch
+from common.output import write_rows
+from common.metrics import begin_run, count
+
+begin_run("scrape_kitchen_cleaning", "web-scraping/ecommerce")
 
 # Headers to simulate a real browser request (to avoid anti-scraping measures)
 headers = {
@@ -16,7 +19,7 @@ data = []
 # Loop through pages (update range if you need more pages)
 for page in range(1, 2):
     url = base_url.format(page=page)
-    response = requests.get(url, headers=headers)
+    response = fetch(url, headers=headers)
 
     if response.status_code == 200:
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -44,9 +47,9 @@ for page in range(1, 2):
     else:
         print(f"Failed to retrieve page {page}. Status code: {response.status_code}")
 
-# Convert data to a DataFrame and save as CSV in the desired directory
-df = pd.DataFrame(data)
+# Save as CSV in the desired directory
 output_path = 'web-scraping/ecommerce/kitchen_cleaning_products.csv'  # Update path to where you want to save it
-df.to_csv(output_path, index=False)
+count("items", len(data))
+write_rows(output_path, data)
 
 print(f"Scraping completed and data saved to {output_path}")
@@ -1,7 +1,11 @@
-import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import os
+from common.fetch import fetch
+from common.fingerprint import WOOCOMMERCE_CONTAINER, skip_unchanged_page
+from common.output import write_rows
+from common.metrics import begin_run, count
+
+begin_run("scrape_perfumes", "web-scraping/ecommerce")
 
 # URL of the page to scrape
 url = 'https://addisber.com/product-category/cosmetics/perfumes/'
@@ -12,13 +16,20 @@ headers = {
 }
 
 # Send the HTTP request
-response = requests.get(url, headers=headers)
+response = fetch(url, headers=headers)
 if response.status_code == 200:
     print("Page fetched successfully")
 else:
     print(f"Failed to retrieve the page. Status code: {response.status_code}")
     exit()
 
+# Nothing to do when the product grid is as it was on the last run
+prints = skip_unchanged_page(
+    'scrape_perfumes', url, response.text,
+    outputs=['web-scraping/ecommerce/addisber_com_cosmetics_perfumes.csv'],
+    container=WOOCOMMERCE_CONTAINER,
+)
+
 # Parse the content of the page
 soup = BeautifulSoup(response.text, 'html.parser')
 data = []
@@ -41,9 +52,6 @@ for product in products:
         'link': link
     })
 
-# Create DataFrame
-df = pd.DataFrame(data)
-
 # Define the output path in the ecommerce directory
 output_dir = 'web-scraping/ecommerce/'
 output_file = 'addisber_com_cosmetics_perfumes.csv'
@@ -52,6 +60,8 @@ output_file = 'addisber_com_cosmetics_perfumes.csv'
 os.makedirs(output_dir, exist_ok=True)
 
 # Save the data to a CSV file in the correct directory
-df.to_csv(os.path.join(output_dir, output_file), index=False)
+count("items", len(data))
+write_rows(os.path.join(output_dir, output_file), data)
 
 print("Scraping completed and data saved.")
+prints.save()
@@ -1,6 +1,10 @@
-from playwright.sync_api import sync_playwright
 import pandas as pd
-import os
+from common.browser import launch_browser, new_context
+from common.extract import extract_all
+from common.known import KnownIndex
+from common.storage import history_store
+from common.fingerprint import Fingerprints, rows_fingerprint
+from common.metrics import instrumented
 
 # Base URL for scraping
 base_url = 'https://www.ubuy.et/en/category/electronics-10171?page={}'
@@ -13,18 +17,29 @@ headers = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
 }
 
+# Fields read from each product card (title, price and link)
+PRODUCT_FIELDS = {
+    'title': "h3.product-title.m-0.mt-2",
+    'price': "h3.product-price.m-0.mt-2",
+    'link': ("a[href]", '@href'),
+}
+PRODUCT_DEFAULTS = {'title': 'No title', 'price': 'No price', 'link': 'No link'}
+
 # Function to scrape the data
-def scrape_data():
+@instrumented("ubuy", "web-scraping/ecommerce")
+def scrape_data(browser):
     page_number = 1
     all_scraped_data = []
 
-    with sync_playwright() as p:
-        # Launch Chromium in headless mode
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    # Titles seen earlier in this run; the ones already saved are looked up when the data is saved
+    store = history_store("ubuy", output_path, 'title')
+    known_titles = KnownIndex('title')
+    # Each page's products, compared with the last run's
+    prints = Fingerprints("ubuy", store=store)
 
-        # Set the custom headers to the browser context to simulate a real browser request
-        page.set_extra_http_headers(headers)
+    # Set the custom headers on a dedicated browser context to simulate a real browser request
+    with new_context(browser, "ubuy", extra_http_headers=headers) as context:
+        page = context.new_page()
         
         while True:
             # Construct the URL for the current page
@@ -34,37 +49,23 @@ def scrape_data():
             # Wait for the products to be loaded
             page.wait_for_selector("div.col-lg-3.col-md-4.col-sm-6.col-12.p-0.listing-product")
 
-            # Extract product details
-            products = page.query_selector_all("div.col-lg-3.col-md-4.col-sm-6.col-12.p-0.listing-product")
+            # Extract product details for the whole page in one browser round trip
+            products = extract_all(page, "div.col-lg-3.col-md-4.col-sm-6.col-12.p-0.listing-product", PRODUCT_FIELDS, defaults=PRODUCT_DEFAULTS, strip=False)
             
             if not products:
                 # If no products are found, break out of the loop (end of pagination)
                 print(f"No products found on page {page_number}. Stopping scrape.")
                 break
+            prints.check(url, rows_fingerprint(products))
 
             # Extract the product data from each product on the current page
             for product in products:
-                # Extract title
-                title_element = product.query_selector("h3.product-title.m-0.mt-2")
-                title = title_element.inner_text() if title_element else 'No title'
-
-                # Extract price
-                price_element = product.query_selector("h3.product-price.m-0.mt-2")
-                price = price_element.inner_text() if price_element else 'No price'
-
-                # Extract link
-                link_element = product.query_selector("a[href]")
-                link = link_element.get_attribute('href') if link_element else 'No link'
-                
-                # Load existing data to compare and highlight new vs. existing products
-                try:
-                    existing_df = pd.read_csv(output_path)
-                    existing_titles = set(existing_df['title'])
-                except FileNotFoundError:
-                    existing_titles = set()
+                title = product['title']
+                price = product['price']
+                link = product['link']
 
                 # Check if the product is new or existing
-                highlight = 'new' if title not in existing_titles else 'existing'
+                highlight = known_titles.mark(title)
 
                 # Append the data to the list
                 all_scraped_data.append({
@@ -83,37 +84,30 @@ def scrape_data():
                 # If there is no next page button, stop the scraping
                 print(f"End of pagination reached. Scraping completed.")
                 break
-        
-        # Close the browser
-        browser.close()
 
-        # Save the scraped data to a CSV file
-        save_to_csv(all_scraped_data)
+    # Nothing to save when every page matches the last run
+    if prints.up_to_date():
+        return
 
-# Function to save the scraped data to CSV using pandas
-def save_to_csv(data):
+    # Save the scraped data to the history store
+    save_to_csv(all_scraped_data, store)
+    prints.save()
+
+# Function to save the scraped data using pandas
+def save_to_csv(data, store):
     # Convert the list of dictionaries to a pandas DataFrame
     df = pd.DataFrame(data)
 
-    # Check if the file exists, if so, append new data, else create a new file
-    try:
-        # Try to load the existing data
-        existing_df = pd.read_csv(output_path)
-        # Append new data to the existing dataframe
-        df = pd.concat([existing_df, df], ignore_index=True).drop_duplicates(subset=['title'], keep='last')
-    except FileNotFoundError:
-        # If the file doesn't exist, no action is taken and a new one will be created
-        pass
-    
-    # Ensure the target directory exists
-    output_dir = os.path.dirname(output_path)
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
+    # Products already saved are existing as well
+    if not df.empty:
+        df.loc[store.contains(df), 'highlight'] = 'existing'
 
-    # Save the DataFrame to CSV
-    df.to_csv(output_path, index=False)
+    # Append new data to the history (a fresh history is just the new data) and save it (and the CSV export)
+    store.merge(df, status_column=None)
     
-    print(f"Data saved to '{output_path}'")
+    print(f"Data saved to '{store.location}'")
 
 # Directly call the function to start the scraping process
-scrape_data()
+if __name__ == "__main__":
+    with launch_browser() as browser:
+        scrape_data(browser)